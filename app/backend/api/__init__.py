@@ -1,3 +1,3 @@
-from app.backend.api import collections, envs, execute, history, requests
+from app.backend.api import collections, envs, execute, history, mocks, requests
 
-__all__ = ["collections", "envs", "execute", "history", "requests"]
+__all__ = ["collections", "envs", "execute", "history", "mocks", "requests"]
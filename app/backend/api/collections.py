@@ -1,54 +1,198 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import tempfile
+import time
+from typing import Literal
 
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import Request as HttpRequest
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
 from app.backend.database import get_db
 from app.backend.models.collection import Collection
-from app.backend.schemas.collection import CollectionCreate, CollectionOut, CollectionUpdate
+from app.backend.models.request import Request
+from app.backend.schemas.collection import (
+    CollectionBatchCreate,
+    CollectionBatchUpdate,
+    CollectionCreate,
+    CollectionImportResult,
+    CollectionOut,
+    CollectionUpdate,
+    WorkspaceTree,
+)
+from app.backend.schemas.request import BatchDelete, RequestPage
+from app.backend.schemas.run import CollectionRunReport, CollectionRunRequest
+from app.backend.services.environments import resolve_environment
+from app.backend.services.executor import request_spec
+from app.backend.services.history import history_writer
+from app.backend.services.runner import HostRateLimiter, build_report, run_specs
+from app.backend.services.transfer import ImportFormatError, export_postman, import_collection
+from app.backend.services.workspace import delete_collections, page_requests, workspace_tree
 
 router = APIRouter(prefix="/collections", tags=["collections"])
 
 
 @router.get("", response_model=list[CollectionOut])
-def list_collections(db: Session = Depends(get_db)):
-    return db.query(Collection).order_by(Collection.id).all()
+async def list_collections(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Collection).order_by(Collection.id))
+    return result.scalars().all()
 
 
 @router.post("", response_model=CollectionOut)
-def create_collection(payload: CollectionCreate, db: Session = Depends(get_db)):
+async def create_collection(payload: CollectionCreate, db: AsyncSession = Depends(get_db)):
     collection = Collection(name=payload.name, description=payload.description)
     db.add(collection)
-    db.commit()
-    db.refresh(collection)
+    await db.commit()
+    await db.refresh(collection)
     return collection
 
 
+@router.get("/tree", response_model=WorkspaceTree)
+async def get_workspace_tree(db: AsyncSession = Depends(get_db)):
+    return await workspace_tree(db)
+
+
+@router.post("/batch", response_model=list[CollectionOut])
+async def create_collections(payload: CollectionBatchCreate, db: AsyncSession = Depends(get_db)):
+    collections = [Collection(name=item.name, description=item.description) for item in payload.items]
+    db.add_all(collections)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A collection with this name already exists")
+    return collections
+
+
+@router.put("/batch", response_model=list[CollectionOut])
+async def update_collections(payload: CollectionBatchUpdate, db: AsyncSession = Depends(get_db)):
+    ids = [item.id for item in payload.items]
+    result = await db.execute(select(Collection).where(Collection.id.in_(ids)))
+    found = {collection.id: collection for collection in result.scalars()}
+    missing = sorted(set(ids) - found.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Collections not found: {missing}")
+    for item in payload.items:
+        for key, value in item.model_dump(exclude_unset=True, exclude={"id"}).items():
+            setattr(found[item.id], key, value)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A collection with this name already exists")
+    return [found[collection_id] for collection_id in ids]
+
+
+@router.post("/batch/delete")
+async def delete_collections_batch(payload: BatchDelete, db: AsyncSession = Depends(get_db)):
+    return {"deleted": await delete_collections(db, payload.ids)}
+
+
+@router.post("/import", response_model=CollectionImportResult)
+async def import_collection_file(
+    request: HttpRequest,
+    format: Literal["auto", "postman", "openapi", "har"] = "auto",
+    name: str | None = Query(default=None, min_length=1, max_length=150),
+    db: AsyncSession = Depends(get_db),
+):
+    with tempfile.SpooledTemporaryFile(max_size=settings.transfer_spool_bytes) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        try:
+            collection, detected, imported = await import_collection(db, spool, format, name)
+        except ImportFormatError as exc:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=str(exc))
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="A collection with this name already exists")
+    return {"collection_id": collection.id, "name": collection.name, "format": detected, "imported": imported}
+
+
+@router.get("/{collection_id}/export")
+async def export_collection(collection_id: int, db: AsyncSession = Depends(get_db)):
+    collection = await db.get(Collection, collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    filename = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in collection.name) or "collection"
+    return StreamingResponse(
+        export_postman(collection),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.postman_collection.json"'},
+    )
+
+
+@router.get("/{collection_id}/requests", response_model=RequestPage)
+async def list_collection_requests(
+    collection_id: int,
+    cursor: int | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    collection = await db.get(Collection, collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    items, next_cursor = await page_requests(db, collection_id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.get("/{collection_id}", response_model=CollectionOut)
-def get_collection(collection_id: int, db: Session = Depends(get_db)):
-    collection = db.query(Collection).filter(Collection.id == collection_id).first()
+async def get_collection(collection_id: int, db: AsyncSession = Depends(get_db)):
+    collection = await db.get(Collection, collection_id)
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     return collection
 
 
 @router.put("/{collection_id}", response_model=CollectionOut)
-def update_collection(collection_id: int, payload: CollectionUpdate, db: Session = Depends(get_db)):
-    collection = db.query(Collection).filter(Collection.id == collection_id).first()
+async def update_collection(collection_id: int, payload: CollectionUpdate, db: AsyncSession = Depends(get_db)):
+    collection = await db.get(Collection, collection_id)
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(collection, key, value)
-    db.commit()
-    db.refresh(collection)
+    await db.commit()
+    await db.refresh(collection)
     return collection
 
 
 @router.delete("/{collection_id}")
-def delete_collection(collection_id: int, db: Session = Depends(get_db)):
-    collection = db.query(Collection).filter(Collection.id == collection_id).first()
-    if not collection:
+async def delete_collection(collection_id: int, db: AsyncSession = Depends(get_db)):
+    if not await delete_collections(db, [collection_id]):
         raise HTTPException(status_code=404, detail="Collection not found")
-    db.delete(collection)
-    db.commit()
     return {"ok": True}
+
+
+@router.post("/{collection_id}/run", response_model=CollectionRunReport)
+async def run_collection(collection_id: int, payload: CollectionRunRequest, db: AsyncSession = Depends(get_db)):
+    collection = await db.get(Collection, collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    environment = await resolve_environment(db, payload.env_id, payload.use_active_env)
+    if environment is None:
+        raise HTTPException(status_code=404, detail="Environment not found")
+    variables, base_url = environment
+
+    result = await db.execute(select(Request).where(Request.collection_id == collection_id).order_by(Request.id))
+    specs = [request_spec(request) for request in result.scalars()]
+
+    start = time.perf_counter()
+    results = await run_specs(
+        specs,
+        variables,
+        base_url,
+        concurrency=payload.concurrency,
+        limiter=HostRateLimiter(payload.per_host_rps, payload.host_rps),
+    )
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
+
+    if payload.save_history:
+        for result in results:
+            if "snapshots" in result:
+                await history_writer.submit(*result["snapshots"])
+
+    return {"collection_id": collection_id, **build_report(results, elapsed_ms)}
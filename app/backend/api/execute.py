@@ -1,58 +1,148 @@
 from __future__ import annotations
 
+import base64
+import json
+from typing import Any
+
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.backend.database import get_db
-from app.backend.models.environment import Environment
-from app.backend.schemas.execute import ExecuteRequest, ExecuteResponse
-from app.backend.services.http_client import execute_http_request
-from app.backend.services.history import save_history
-from app.backend.services.tests import run_tests
-from app.backend.services.variables import substitute_variables
+from app.backend.models.request import Request
+from app.backend.schemas.execute import ExecuteRequest, ExecuteResponse, LoadTestReport, LoadTestRequest
+from app.backend.services.environments import resolve_environment
+from app.backend.services.executions import ExecutionCancelled, cancel_execution, run_cancellable
+from app.backend.services.executor import compile_request, request_spec, send_prepared
+from app.backend.services.history import history_writer
+from app.backend.services.http_client import iter_http_request
+from app.backend.services.load import run_load
+from app.backend.services.replay import prepared_fingerprint, response_cache
+from app.backend.services.tests import CompiledTests
 
 router = APIRouter(prefix="/execute", tags=["execute"])
 
 
 @router.post("", response_model=ExecuteResponse)
-def execute(payload: ExecuteRequest, db: Session = Depends(get_db)):
-    variables: dict[str, str] = {}
-    base_url = ""
-    if payload.env_id is not None:
-        env = db.query(Environment).filter(Environment.id == payload.env_id).first()
-        if not env:
-            raise HTTPException(status_code=404, detail="Environment not found")
-        variables = env.variables or {}
-        base_url = env.base_url or ""
-
-    url = substitute_variables(payload.url, variables)
-    headers = substitute_variables(payload.headers, variables)
-    params = substitute_variables(payload.params, variables)
-    body = substitute_variables(payload.body, variables)
-
-    if base_url and url.startswith("/"):
-        url = base_url.rstrip("/") + url
-    elif base_url and not url.startswith("http"):
-        url = base_url.rstrip("/") + "/" + url.lstrip("/")
-
-    request_snapshot, response_snapshot = execute_http_request(
-        method=payload.method,
-        url=url,
-        headers=headers,
-        params=params,
-        body_type=payload.body_type,
-        body=body,
-        auth=payload.auth.model_dump(by_alias=True),
-    )
+async def execute(payload: ExecuteRequest, db: AsyncSession = Depends(get_db)):
+    environment = await resolve_environment(db, payload.env_id, payload.use_active_env)
+    if environment is None:
+        raise HTTPException(status_code=404, detail="Environment not found")
+    variables, base_url = environment
 
-    tests_result = run_tests(payload.tests, response_snapshot)
-    response_snapshot["tests"] = tests_result
+    compiled = compile_request(payload.model_dump(by_alias=True), base_url)
+    prepared = compiled.render(variables)
+    fingerprint = None
+    cached = None
+    if payload.cache_mode != "off":
+        fingerprint = prepared_fingerprint(prepared)
+        cached = await response_cache.lookup(db, fingerprint)
+        if cached is not None and (payload.cache_mode == "offline" or cached.is_fresh(payload.cache_ttl_seconds)):
+            return _replayed(cached.response, compiled.tests)
+        if payload.cache_mode == "offline":
+            raise HTTPException(status_code=504, detail="No recorded response for this request")
+        if cached is not None:
+            prepared = {**prepared, "headers": {**prepared["headers"], **cached.validators()}}
 
-    save_history(
-        db,
-        request_snapshot=request_snapshot,
-        response_snapshot=response_snapshot,
-        duration_ms=response_snapshot["duration_ms"],
-    )
+    try:
+        request_snapshot, response_snapshot = await run_cancellable(
+            payload.execution_id, send_prepared(prepared, compiled.tests)
+        )
+    except ExecutionCancelled:
+        raise HTTPException(status_code=409, detail="Execution cancelled")
+
+    if cached is not None and response_snapshot["status_code"] == 304:
+        response_cache.refresh(fingerprint)
+        return _replayed(cached.response, compiled.tests)
+
+    await history_writer.submit(request_snapshot, response_snapshot)
+    if fingerprint is not None:
+        response_cache.remember(fingerprint, response_snapshot)
 
     return ExecuteResponse(**response_snapshot)
+
+
+def _replayed(response_snapshot: dict, tests: CompiledTests) -> ExecuteResponse:
+    return ExecuteResponse(**{**response_snapshot, "tests": tests.run(response_snapshot), "cached": True})
+
+
+@router.get("/cache")
+async def cache_stats():
+    return response_cache.stats()
+
+
+@router.delete("/cache")
+async def clear_cache():
+    response_cache.clear()
+    return {"ok": True}
+
+
+def _sse(event: str, data: Any) -> str:
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post("/stream")
+async def execute_stream(payload: ExecuteRequest, db: AsyncSession = Depends(get_db)):
+    environment = await resolve_environment(db, payload.env_id, payload.use_active_env)
+    if environment is None:
+        raise HTTPException(status_code=404, detail="Environment not found")
+    variables, base_url = environment
+    compiled = compile_request(payload.model_dump(by_alias=True), base_url)
+    prepared = compiled.render(variables)
+
+    async def _events():
+        try:
+            async for event, data in iter_http_request(**prepared):
+                if event == "meta":
+                    yield _sse("meta", data)
+                elif event == "chunk":
+                    yield _sse("chunk", base64.b64encode(data).decode("ascii"))
+                else:
+                    request_snapshot, response_snapshot = data
+                    response_snapshot["tests"] = compiled.tests.run(response_snapshot)
+                    await history_writer.submit(request_snapshot, response_snapshot)
+                    summary = {k: v for k, v in response_snapshot.items() if k != "body"}
+                    yield _sse("done", summary)
+        except httpx.HTTPError as exc:
+            yield _sse("error", {"error": f"{type(exc).__name__}: {exc}"})
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/load", response_model=LoadTestReport)
+async def execute_load(payload: LoadTestRequest, db: AsyncSession = Depends(get_db)):
+    env_id = payload.env_id
+    use_active_env = payload.use_active_env
+    if payload.request is not None:
+        spec = payload.request.model_dump(by_alias=True)
+        env_id = env_id if env_id is not None else payload.request.env_id
+        use_active_env = use_active_env or payload.request.use_active_env
+    else:
+        request = await db.get(Request, payload.request_id)
+        if not request:
+            raise HTTPException(status_code=404, detail="Request not found")
+        spec = request_spec(request)
+
+    environment = await resolve_environment(db, env_id, use_active_env)
+    if environment is None:
+        raise HTTPException(status_code=404, detail="Environment not found")
+    variables, base_url = environment
+
+    return await run_load(
+        compile_request(spec, base_url),
+        variables,
+        concurrency=payload.concurrency,
+        rps=payload.rps,
+        total_requests=payload.total_requests,
+        duration_seconds=payload.duration_seconds,
+        ramp_up_seconds=payload.ramp_up_seconds,
+    )
+
+
+@router.delete("/{execution_id}")
+async def cancel(execution_id: str):
+    if not cancel_execution(execution_id):
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return {"ok": True}
@@ -1,25 +1,105 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import json
 
-from app.backend.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.database import SessionLocal, get_db
 from app.backend.models.history import History
-from app.backend.schemas.history import HistoryOut
+from app.backend.schemas.history import HistoryFilters, HistoryOut, HistoryPage, HistorySummary
+from app.backend.services.blobs import collect_orphan_blobs, load_body, stream_blob
+from app.backend.services.history import delete_history, history_writer, list_history_summaries
+from app.backend.services.retention import history_pruner, reclaim_space
 
 router = APIRouter(prefix="/history", tags=["history"])
 
 
-@router.get("", response_model=list[HistoryOut])
-def list_history(db: Session = Depends(get_db)):
-    return db.query(History).order_by(History.id.desc()).all()
+@router.get("", response_model=HistoryPage)
+async def list_history(
+    filters: HistoryFilters = Depends(),
+    cursor: int | None = None,
+    limit: int = Query(default=50, ge=1, le=settings.history_page_max_size),
+    db: AsyncSession = Depends(get_db),
+):
+    items = await list_history_summaries(db, filters, cursor, limit)
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
 
 
-@router.delete("/{history_id}")
-def delete_history(history_id: int, db: Session = Depends(get_db)):
-    item = db.query(History).filter(History.id == history_id).first()
+@router.delete("")
+async def clear_history(filters: HistoryFilters = Depends(), db: AsyncSession = Depends(get_db)):
+    deleted = await delete_history(db, filters)
+    blobs = await collect_orphan_blobs(db)
+    if deleted:
+        await reclaim_space()
+    return {"deleted": deleted, "blobs_deleted": blobs}
+
+
+@router.get("/stream")
+async def stream_history(filters: HistoryFilters = Depends()):
+    async def _lines():
+        cursor = None
+        async with SessionLocal() as db:
+            while True:
+                items = await list_history_summaries(db, filters, cursor, settings.history_page_max_size)
+                for item in items:
+                    yield HistorySummary(**item).model_dump_json() + "\n"
+                if len(items) < settings.history_page_max_size:
+                    break
+                cursor = items[-1]["id"]
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/writer")
+async def history_writer_stats():
+    return history_writer.stats()
+
+
+@router.post("/prune")
+async def prune_history_now():
+    deleted = await history_pruner.run_once()
+    return {"deleted": deleted}
+
+
+@router.get("/{history_id}", response_model=HistoryOut)
+async def get_history(history_id: int, include_body: bool = False, db: AsyncSession = Depends(get_db)):
+    item = await db.get(History, history_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="History not found")
+    body_ref = item.response_snapshot.get("body_ref")
+    if include_body and body_ref:
+        response_snapshot = {**item.response_snapshot, "body": await load_body(db, body_ref)}
+        return HistoryOut.model_validate(item).model_copy(update={"response_snapshot": response_snapshot})
+    return item
+
+
+@router.get("/{history_id}/body")
+async def get_history_body(history_id: int, db: AsyncSession = Depends(get_db)):
+    item = await db.get(History, history_id)
     if not item:
         raise HTTPException(status_code=404, detail="History not found")
-    db.delete(item)
-    db.commit()
+    response_snapshot = item.response_snapshot
+    media_type = (response_snapshot.get("headers") or {}).get("content-type", "application/octet-stream")
+    body_ref = response_snapshot.get("body_ref")
+    if not body_ref:
+        body = response_snapshot.get("body")
+        content = json.dumps(body) if isinstance(body, (dict, list)) else str(body or "")
+        return Response(content=content, media_type=media_type)
+    chunks = await stream_blob(db, body_ref["digest"])
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Body not found")
+    return StreamingResponse(chunks, media_type=media_type)
+
+
+@router.delete("/{history_id}")
+async def delete_history_item(history_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(delete(History).where(History.id == history_id))
+    if not result.rowcount:
+        raise HTTPException(status_code=404, detail="History not found")
+    await db.commit()
     return {"ok": True}
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.database import get_db
+from app.backend.models.collection import Collection
+from app.backend.schemas.mock import MockServerCreate, MockServerOut
+from app.backend.services.mock_server import build_routes, mock_servers
+
+router = APIRouter(prefix="/mocks", tags=["mocks"])
+
+
+@router.get("", response_model=list[MockServerOut])
+async def list_mocks():
+    return [server.describe() for server in mock_servers.servers()]
+
+
+@router.post("", response_model=MockServerOut)
+async def start_mock(payload: MockServerCreate, db: AsyncSession = Depends(get_db)):
+    collection = await db.get(Collection, payload.collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    routes = await build_routes(db, payload.collection_id)
+    try:
+        server = await mock_servers.start(routes=routes, **payload.model_dump())
+    except (OSError, RuntimeError) as exc:
+        raise HTTPException(status_code=409, detail=f"Could not start mock server: {exc}")
+    return server.describe()
+
+
+@router.get("/{mock_id}", response_model=MockServerOut)
+async def get_mock(mock_id: int):
+    server = mock_servers.get(mock_id)
+    if server is None:
+        raise HTTPException(status_code=404, detail="Mock server not found")
+    return server.describe()
+
+
+@router.delete("/{mock_id}")
+async def stop_mock(mock_id: int):
+    if not await mock_servers.stop(mock_id):
+        raise HTTPException(status_code=404, detail="Mock server not found")
+    return {"ok": True}
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.backend.database import get_db
+from app.backend.models.collection import Collection
 from app.backend.models.request import Request
-from app.backend.schemas.request import RequestCreate, RequestOut, RequestUpdate
+from app.backend.schemas.request import (
+    BatchDelete,
+    RequestBatchCreate,
+    RequestBatchUpdate,
+    RequestCreate,
+    RequestOut,
+    RequestPage,
+    RequestUpdate,
+)
+from app.backend.services.workspace import page_requests
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 
 
-@router.post("", response_model=RequestOut)
-def create_request(payload: RequestCreate, db: Session = Depends(get_db)):
-    request = Request(
+def _new_request(payload: RequestCreate) -> Request:
+    return Request(
         name=payload.name,
         method=payload.method,
         url=payload.url,
@@ -22,42 +35,115 @@ def create_request(payload: RequestCreate, db: Session = Depends(get_db)):
         body=payload.body,
         auth=payload.auth.model_dump(by_alias=True),
         tests=payload.tests,
+        extract=[rule.model_dump() for rule in payload.extract],
         collection_id=payload.collection_id,
     )
+
+
+def _apply_update(request: Request, payload: RequestUpdate) -> None:
+    update_data: dict[str, Any] = payload.model_dump(exclude_unset=True, exclude={"id"})
+    if update_data.get("auth") is not None:
+        update_data["auth"] = payload.auth.model_dump(by_alias=True)
+    for key, value in update_data.items():
+        setattr(request, key, value)
+
+
+async def _ensure_collections(db: AsyncSession, ids: set[int | None]) -> None:
+    wanted = {collection_id for collection_id in ids if collection_id is not None}
+    if not wanted:
+        return
+    result = await db.execute(select(Collection.id).where(Collection.id.in_(wanted)))
+    missing = sorted(wanted - set(result.scalars()))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Collections not found: {missing}")
+
+
+async def _commit(db: AsyncSession) -> None:
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Request conflicts with stored data: {exc.orig}")
+
+
+@router.get("", response_model=RequestPage)
+async def list_requests(
+    collection_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    items, next_cursor = await page_requests(db, collection_id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("", response_model=RequestOut)
+async def create_request(payload: RequestCreate, db: AsyncSession = Depends(get_db)):
+    await _ensure_collections(db, {payload.collection_id})
+    request = _new_request(payload)
     db.add(request)
-    db.commit()
-    db.refresh(request)
+    await _commit(db)
+    await db.refresh(request)
     return request
 
 
+@router.post("/batch", response_model=list[RequestOut])
+async def create_requests(payload: RequestBatchCreate, db: AsyncSession = Depends(get_db)):
+    await _ensure_collections(db, {item.collection_id for item in payload.items})
+    requests = [_new_request(item) for item in payload.items]
+    db.add_all(requests)
+    await _commit(db)
+    return requests
+
+
+@router.put("/batch", response_model=list[RequestOut])
+async def update_requests(payload: RequestBatchUpdate, db: AsyncSession = Depends(get_db)):
+    ids = [item.id for item in payload.items]
+    result = await db.execute(select(Request).where(Request.id.in_(ids)))
+    found = {request.id: request for request in result.scalars()}
+    missing = sorted(set(ids) - found.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Requests not found: {missing}")
+    moved = {item.collection_id for item in payload.items if "collection_id" in item.model_fields_set}
+    await _ensure_collections(db, moved)
+    for item in payload.items:
+        _apply_update(found[item.id], item)
+    await _commit(db)
+    return [found[request_id] for request_id in ids]
+
+
+@router.post("/batch/delete")
+async def delete_requests(payload: BatchDelete, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(delete(Request).where(Request.id.in_(payload.ids)))
+    await db.commit()
+    return {"deleted": result.rowcount or 0}
+
+
 @router.get("/{request_id}", response_model=RequestOut)
-def get_request(request_id: int, db: Session = Depends(get_db)):
-    request = db.query(Request).filter(Request.id == request_id).first()
+async def get_request(request_id: int, db: AsyncSession = Depends(get_db)):
+    request = await db.get(Request, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     return request
 
 
 @router.put("/{request_id}", response_model=RequestOut)
-def update_request(request_id: int, payload: RequestUpdate, db: Session = Depends(get_db)):
-    request = db.query(Request).filter(Request.id == request_id).first()
+async def update_request(request_id: int, payload: RequestUpdate, db: AsyncSession = Depends(get_db)):
+    request = await db.get(Request, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
-    update_data = payload.model_dump(exclude_unset=True)
-    if "auth" in update_data and update_data["auth"] is not None:
-        update_data["auth"] = update_data["auth"].model_dump(by_alias=True)
-    for key, value in update_data.items():
-        setattr(request, key, value)
-    db.commit()
-    db.refresh(request)
+    if "collection_id" in payload.model_fields_set:
+        await _ensure_collections(db, {payload.collection_id})
+    _apply_update(request, payload)
+    await _commit(db)
+    await db.refresh(request)
     return request
 
 
 @router.delete("/{request_id}")
-def delete_request(request_id: int, db: Session = Depends(get_db)):
-    request = db.query(Request).filter(Request.id == request_id).first()
-    if not request:
+async def delete_request(request_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(delete(Request).where(Request.id == request_id))
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Request not found")
-    db.delete(request)
-    db.commit()
+    await db.commit()
     return {"ok": True}
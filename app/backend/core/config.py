@@ -5,6 +5,45 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./data/app.db"
     request_timeout_seconds: float = 30.0
     history_max_items: int = 500
+    history_max_age_days: float = 0.0
+    history_max_bytes: int = 0
+    history_page_max_size: int = 500
+    history_prune_interval_seconds: float = 60.0
+    history_prune_batch_size: int = 500
+    history_vacuum_after_prune: bool = False
+    blob_threshold_bytes: int = 64 * 1024
+    blob_compression: str = "auto"
+    blob_orphan_grace_seconds: float = 600.0
+    sqlite_auto_vacuum: str = "incremental"
+    sqlite_auto_vacuum_rebuild: bool = False
+    sqlite_incremental_vacuum_pages: int = 1000
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    history_queue_size: int = 10000
+    history_batch_size: int = 200
+    history_flush_interval_seconds: float = 0.5
+    history_overflow_policy: str = "block"
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = False
+    response_max_buffer_bytes: int = 10 * 1024 * 1024
+    response_overflow_policy: str = "truncate"
+    runner_concurrency: int = 10
+    runner_per_host_rps: float = 0.0
+    secret_previous_keys: str = ""
+    secret_rotate_on_startup: bool = False
+    cache_max_entries: int = 256
+    cache_default_ttl_seconds: float = 300.0
+    cache_key_headers: str = "accept,authorization,content-type"
+    transfer_batch_size: int = 1000
+    transfer_spool_bytes: int = 8 * 1024 * 1024
 
     class Config:
         env_prefix = "POSTMAN_"
@@ -1,24 +1,58 @@
 from __future__ import annotations
 
+import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from sqlalchemy import JSON
+from sqlalchemy.types import TypeDecorator
+
+from app.backend.core.config import settings
 
 KEY_PATH = Path(__file__).resolve().parent.parent / "data" / ".key"
+ENCRYPTED_PREFIX = "enc:"
 
 
-def _load_or_create_key() -> bytes:
+def _load_or_create_keys() -> list[bytes]:
     KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if KEY_PATH.exists():
-        return KEY_PATH.read_bytes()
-    key = Fernet.generate_key()
-    KEY_PATH.write_bytes(key)
-    return key
+    if not KEY_PATH.exists():
+        KEY_PATH.write_bytes(Fernet.generate_key() + b"\n")
+    keys = [line.strip() for line in KEY_PATH.read_bytes().splitlines() if line.strip()]
+    keys.extend(key.strip().encode("utf-8") for key in settings.secret_previous_keys.split(",") if key.strip())
+    return keys
+
+
+@lru_cache(maxsize=1)
+def get_fernet() -> MultiFernet:
+    return MultiFernet([Fernet(key) for key in _load_or_create_keys()])
+
 
+@lru_cache(maxsize=1)
+def get_primary_fernet() -> Fernet:
+    return Fernet(_load_or_create_keys()[0])
 
-def get_fernet() -> Fernet:
-    return Fernet(_load_or_create_key())
+
+def rotate_key() -> None:
+    keys = _load_or_create_keys()
+    KEY_PATH.write_bytes(b"\n".join([Fernet.generate_key(), *keys]) + b"\n")
+    get_fernet.cache_clear()
+    get_primary_fernet.cache_clear()
+    _decrypt_token.cache_clear()
+
+
+def is_current_token(token: str) -> bool:
+    try:
+        get_primary_fernet().decrypt(token.encode("utf-8"))
+    except InvalidToken:
+        return False
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _decrypt_token(token: str) -> str:
+    return get_fernet().decrypt(token.encode("utf-8")).decode("utf-8")
 
 
 def encrypt_value(value: str) -> str:
@@ -31,8 +65,23 @@ def decrypt_value(value: str) -> str:
     if not value:
         return value
     try:
-        return get_fernet().decrypt(value.encode("utf-8")).decode("utf-8")
-    except Exception:
+        return _decrypt_token(value)
+    except InvalidToken:
+        return value
+
+
+class EncryptedJSON(TypeDecorator):
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return ENCRYPTED_PREFIX + encrypt_value(json.dumps(value, ensure_ascii=False))
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if isinstance(value, str) and value.startswith(ENCRYPTED_PREFIX):
+            return json.loads(_decrypt_token(value[len(ENCRYPTED_PREFIX) :]))
         return value
 
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import Column, Select, Table, event, func, insert, inspect, literal, select, sql
+from sqlalchemy.engine import Connection, Inspector
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from app.backend.core.config import settings
 
@@ -15,23 +18,132 @@ db_url = settings.database_url
 if db_url.startswith("sqlite:///./data/"):
     db_path = DATA_DIR / "app.db"
     db_url = f"sqlite:///{db_path.as_posix()}"
+if db_url.startswith("sqlite://"):
+    db_url = "sqlite+aiosqlite://" + db_url[len("sqlite://"):]
 
-engine = create_engine(
-    db_url,
-    connect_args={"check_same_thread": False},
-    future=True,
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.endswith("://")):
+        return {"poolclass": StaticPool}
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_pre_ping": not url.startswith("sqlite"),
+    }
+
+
+engine = create_async_engine(db_url, **_engine_options(db_url))
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA auto_vacuum = {settings.sqlite_auto_vacuum.upper()}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode.upper()}")
+    cursor.execute(f"PRAGMA synchronous = {settings.sqlite_synchronous.upper()}")
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size_bytes)}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.close()
+
+
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db() -> Generator:
+def sync_schema(connection: Connection) -> None:
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _foreign_key_signature(referred_table: str, columns: list[str], ondelete: str | None) -> tuple:
+    return referred_table, tuple(columns), (ondelete or "NO ACTION").upper()
+
+
+def _legacy_fallback(column: Column) -> object | None:
+    default = column.default
+    if default is None or column.nullable or column.primary_key:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg if default.is_scalar else None
+
+
+def _legacy_select(table: Table, legacy: str) -> Select:
+    source = sql.table(legacy, *(sql.column(item.name) for item in table.columns))
+    selected = []
+    for item in table.columns:
+        value = source.c[item.name]
+        fallback = _legacy_fallback(item)
+        if fallback is not None:
+            value = func.coalesce(value, literal(fallback, item.type))
+        selected.append(value)
+    return select(*selected).select_from(source)
+
+
+def _rebuild_table(connection: Connection, table: Table, inspector: Inspector) -> None:
+    for constraint in table.foreign_key_constraints:
+        for column in constraint.columns:
+            if column.nullable:
+                referred = constraint.elements[0].column
+                connection.exec_driver_sql(
+                    f'UPDATE "{table.name}" SET "{column.name}" = NULL '
+                    f'WHERE "{column.name}" IS NOT NULL '
+                    f'AND "{column.name}" NOT IN (SELECT "{referred.name}" FROM "{referred.table.name}")'
+                )
+    indexes = [index["name"] for index in inspector.get_indexes(table.name)]
+    legacy = f"_legacy_{table.name}"
+    connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{legacy}"')
+    for name in indexes:
+        connection.exec_driver_sql(f'DROP INDEX IF EXISTS "{name}"')
+    table.create(connection)
+    names = [item.name for item in table.columns]
+    connection.execute(insert(table).from_select(names, _legacy_select(table, legacy)))
+    connection.exec_driver_sql(f'DROP TABLE "{legacy}"')
+
+
+def sync_foreign_keys(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not table.foreign_key_constraints or not inspector.has_table(table.name):
+            continue
+        wanted = {
+            _foreign_key_signature(constraint.referred_table.name, list(constraint.column_keys), constraint.ondelete)
+            for constraint in table.foreign_key_constraints
+        }
+        existing = {
+            _foreign_key_signature(
+                fk["referred_table"], fk["constrained_columns"], fk.get("options", {}).get("ondelete")
+            )
+            for fk in inspector.get_foreign_keys(table.name)
+        }
+        if wanted != existing:
+            _rebuild_table(connection, table, inspector)
+
+
+async def get_db() -> AsyncGenerator:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
@@ -4,8 +4,13 @@ from pathlib import Path
 
 from fastapi import FastAPI
 
-from app.backend.api import collections, envs, execute, history, requests
-from app.backend.database import Base, engine
+from app.backend.api import collections, envs, execute, history, mocks, requests
+from app.backend.database import Base, engine, sync_foreign_keys, sync_schema
+from app.backend.services.history import backfill_history_columns, history_writer
+from app.backend.services.http_client import close_http_client, init_http_client
+from app.backend.services.mock_server import mock_servers
+from app.backend.services.retention import ensure_auto_vacuum, history_pruner
+from app.backend.services.secrets import encrypt_stored_secrets
 
 
 def create_app() -> FastAPI:
@@ -16,6 +21,15 @@ def create_app() -> FastAPI:
     app.include_router(requests.router)
     app.include_router(execute.router)
     app.include_router(history.router)
+    app.include_router(mocks.router)
+
+    app.add_event_handler("startup", init_http_client)
+    app.add_event_handler("startup", history_writer.start)
+    app.add_event_handler("startup", history_pruner.start)
+    app.add_event_handler("shutdown", mock_servers.stop_all)
+    app.add_event_handler("shutdown", history_pruner.stop)
+    app.add_event_handler("shutdown", history_writer.stop)
+    app.add_event_handler("shutdown", close_http_client)
 
     return app
 
@@ -24,7 +38,21 @@ app = create_app()
 
 
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
     data_dir = Path(__file__).resolve().parent / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(sync_schema)
+        await conn.run_sync(sync_foreign_keys)
+        await backfill_history_columns(conn)
+        await encrypt_stored_secrets(conn)
+    await ensure_auto_vacuum()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    if engine.dialect.name == "sqlite":
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA optimize")
+    await engine.dispose()
@@ -1,6 +1,7 @@
+from app.backend.models.blob import ResponseBlob
 from app.backend.models.collection import Collection
 from app.backend.models.environment import Environment
 from app.backend.models.history import History
 from app.backend.models.request import Request
 
-__all__ = ["Collection", "Environment", "History", "Request"]
+__all__ = ["Collection", "Environment", "History", "Request", "ResponseBlob"]
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from sqlalchemy import DateTime, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.backend.database import Base
 
+if TYPE_CHECKING:
+    from app.backend.models.request import Request
+
 
 class Collection(Base):
     __tablename__ = "collections"
@@ -15,3 +19,6 @@ class Collection(Base):
     name: Mapped[str] = mapped_column(String(150), unique=True, index=True)
     description: Mapped[str] = mapped_column(String(500), default="")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    requests: Mapped[list[Request]] = relationship(
+        back_populates="collection", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, JSON
+from sqlalchemy import DateTime, Integer, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.backend.database import Base
@@ -12,7 +12,14 @@ class History(Base):
     __tablename__ = "history"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    method: Mapped[str | None] = mapped_column(String(10), index=True)
+    url: Mapped[str | None] = mapped_column(String(800), index=True)
+    status_code: Mapped[int | None] = mapped_column(Integer, index=True)
     request_snapshot: Mapped[dict] = mapped_column(JSON)
     response_snapshot: Mapped[dict] = mapped_column(JSON)
-    duration_ms: Mapped[int] = mapped_column(Integer)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    duration_ms: Mapped[int] = mapped_column(Integer, index=True)
+    stored_bytes: Mapped[int | None] = mapped_column(Integer, default=0)
+    body_digest: Mapped[str | None] = mapped_column(String(64), index=True)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), index=True)
+    timings: Mapped[dict | None] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String, JSON
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.backend.core.security import EncryptedJSON
 from app.backend.database import Base
 
+if TYPE_CHECKING:
+    from app.backend.models.collection import Collection
+
 
 class Request(Base):
     __tablename__ = "requests"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    collection_id: Mapped[int | None] = mapped_column(ForeignKey("collections.id"), nullable=True)
+    collection_id: Mapped[int | None] = mapped_column(
+        ForeignKey("collections.id", ondelete="CASCADE"), nullable=True, index=True
+    )
     name: Mapped[str] = mapped_column(String(150), index=True)
     method: Mapped[str] = mapped_column(String(10), default="GET")
     url: Mapped[str] = mapped_column(String(800))
@@ -20,6 +27,8 @@ class Request(Base):
     params: Mapped[dict] = mapped_column(JSON, default=dict)
     body_type: Mapped[str] = mapped_column(String(20), default="none")
     body: Mapped[dict | str | None] = mapped_column(JSON, default=None)
-    auth: Mapped[dict] = mapped_column(JSON, default=dict)
+    auth: Mapped[dict] = mapped_column(EncryptedJSON, default=dict)
     tests: Mapped[list] = mapped_column(JSON, default=list)
+    extract: Mapped[list | None] = mapped_column(JSON, default=list)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    collection: Mapped[Collection | None] = relationship(back_populates="requests", lazy="raise")
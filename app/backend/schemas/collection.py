@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.backend.schemas.request import RequestSummary
+
 
 class CollectionBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=150)
@@ -20,3 +22,31 @@ class CollectionUpdate(BaseModel):
 class CollectionOut(CollectionBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+class CollectionBatchCreate(BaseModel):
+    items: list[CollectionCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class CollectionBatchUpdateItem(CollectionUpdate):
+    id: int
+
+
+class CollectionBatchUpdate(BaseModel):
+    items: list[CollectionBatchUpdateItem] = Field(..., min_length=1, max_length=1000)
+
+
+class CollectionTree(CollectionOut):
+    requests: list[RequestSummary] = Field(default_factory=list)
+
+
+class WorkspaceTree(BaseModel):
+    collections: list[CollectionTree]
+    unassigned: list[RequestSummary]
+
+
+class CollectionImportResult(BaseModel):
+    collection_id: int
+    name: str
+    format: str
+    imported: int
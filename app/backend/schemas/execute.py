@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.backend.schemas.request import AuthConfig
 
@@ -16,7 +16,11 @@ class ExecuteRequest(BaseModel):
     body: Any | None = None
     auth: AuthConfig = Field(default_factory=AuthConfig)
     env_id: int | None = None
+    use_active_env: bool = False
     tests: list[dict] = Field(default_factory=list)
+    execution_id: str | None = Field(default=None, max_length=64)
+    cache_mode: Literal["off", "use", "offline"] = "off"
+    cache_ttl_seconds: float | None = Field(default=None, ge=0)
 
 
 class ExecuteResponse(BaseModel):
@@ -26,3 +30,45 @@ class ExecuteResponse(BaseModel):
     duration_ms: int
     size_bytes: int
     tests: list[dict]
+    ttfb_ms: int | None = None
+    body_sha256: str | None = None
+    body_truncated: bool = False
+    body_ref: dict | None = None
+    timings: dict[str, float] | None = None
+    connection_reused: bool = False
+    http_version: str | None = None
+    cached: bool = False
+
+
+class LoadTestRequest(BaseModel):
+    request_id: int | None = None
+    request: ExecuteRequest | None = None
+    env_id: int | None = None
+    use_active_env: bool = False
+    concurrency: int = Field(default=10, ge=1, le=10000)
+    rps: float | None = Field(default=None, gt=0)
+    total_requests: int | None = Field(default=None, ge=1)
+    duration_seconds: float | None = Field(default=None, gt=0)
+    ramp_up_seconds: float = Field(default=0.0, ge=0)
+
+    @model_validator(mode="after")
+    def _check_target(self) -> "LoadTestRequest":
+        if (self.request_id is None) == (self.request is None):
+            raise ValueError("provide exactly one of request_id or request")
+        if self.total_requests is None and self.duration_seconds is None:
+            raise ValueError("provide total_requests or duration_seconds")
+        return self
+
+
+class LoadTestReport(BaseModel):
+    total: int
+    completed: int
+    errors: dict[str, int]
+    status_codes: dict[str, int]
+    duration_ms: int
+    throughput_rps: float
+    bytes_sent: int
+    bytes_received: int
+    latency_ms: dict[str, float]
+    timings_ms: dict[str, dict[str, float]]
+    histogram: list[dict[str, float]]
@@ -1,6 +1,34 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class HistoryFilters(BaseModel):
+    method: str | None = None
+    url_prefix: str | None = None
+    status_code: int | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    min_duration_ms: int | None = Field(default=None, ge=0)
+
+
+class HistorySummary(BaseModel):
+    id: int
+    method: str | None
+    url: str | None
+    status_code: int | None
+    duration_ms: int
+    stored_bytes: int | None
+    timings: dict[str, float] | None = None
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class HistoryPage(BaseModel):
+    items: list[HistorySummary]
+    next_cursor: int | None
 
 
 class HistoryOut(BaseModel):
@@ -8,4 +36,5 @@ class HistoryOut(BaseModel):
     request_snapshot: dict
     response_snapshot: dict
     duration_ms: int
+    created_at: datetime
     model_config = ConfigDict(from_attributes=True)
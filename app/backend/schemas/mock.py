@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class MockServerCreate(BaseModel):
+    collection_id: int
+    host: str = "127.0.0.1"
+    port: int = Field(default=0, ge=0, le=65535)
+    latency_ms: float = Field(default=0.0, ge=0)
+    jitter_ms: float = Field(default=0.0, ge=0)
+    error_rate: float = Field(default=0.0, ge=0, le=1)
+    error_status: int = Field(default=500, ge=100, le=599)
+
+
+class MockRouteOut(BaseModel):
+    name: str
+    method: str
+    path: str
+    status_code: int
+    hits: int
+
+
+class MockServerOut(BaseModel):
+    id: int
+    collection_id: int
+    url: str
+    latency_ms: float
+    jitter_ms: float
+    error_rate: float
+    error_status: int
+    served: int
+    errors: int
+    unmatched: int
+    routes: list[MockRouteOut]
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 
 class AuthConfig(BaseModel):
@@ -15,6 +15,12 @@ class AuthConfig(BaseModel):
     in_: str | None = Field(default=None, alias="in")  # header, query
 
 
+class ExtractRule(BaseModel):
+    variable: str = Field(..., min_length=1, max_length=100, pattern=r"^[\w.-]+$")
+    source: Literal["body", "header", "status_code", "regex"] = "body"
+    path: str = Field(default="$", max_length=500)
+
+
 class RequestBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=150)
     method: str = Field(default="GET")
@@ -25,8 +31,14 @@ class RequestBase(BaseModel):
     body: Any | None = None
     auth: AuthConfig = Field(default_factory=AuthConfig)
     tests: list[dict] = Field(default_factory=list)
+    extract: list[ExtractRule] = Field(default_factory=list)
     collection_id: int | None = None
 
+    @field_validator("extract", mode="before")
+    @classmethod
+    def _extract_default(cls, value: Any) -> Any:
+        return [] if value is None else value
+
 
 class RequestCreate(RequestBase):
     pass
@@ -42,9 +54,39 @@ class RequestUpdate(BaseModel):
     body: Any | None = None
     auth: AuthConfig | None = None
     tests: list[dict] | None = None
+    extract: list[ExtractRule] | None = None
     collection_id: int | None = None
 
 
 class RequestOut(RequestBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+class RequestBatchCreate(BaseModel):
+    items: list[RequestCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class RequestBatchUpdateItem(RequestUpdate):
+    id: int
+
+
+class RequestBatchUpdate(BaseModel):
+    items: list[RequestBatchUpdateItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=10000)
+
+
+class RequestSummary(BaseModel):
+    id: int
+    name: str
+    method: str
+    url: str
+    collection_id: int | None = None
+
+
+class RequestPage(BaseModel):
+    items: list[RequestOut]
+    next_cursor: int | None = None
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from app.backend.core.config import settings
+
+
+class CollectionRunRequest(BaseModel):
+    env_id: int | None = None
+    use_active_env: bool = False
+    concurrency: int = Field(default=settings.runner_concurrency, ge=1, le=1000)
+    per_host_rps: float = Field(default=settings.runner_per_host_rps, ge=0)
+    host_rps: dict[str, float] = Field(default_factory=dict)
+    save_history: bool = True
+
+
+class RunResult(BaseModel):
+    request_id: int | None
+    name: str
+    method: str
+    url: str
+    status_code: int | None
+    duration_ms: int | None
+    passed: bool
+    tests: list[dict]
+    timings: dict[str, float] | None = None
+    extracted: dict[str, str] = Field(default_factory=dict)
+    error: str | None
+
+
+class CollectionRunReport(BaseModel):
+    collection_id: int
+    total: int
+    passed: int
+    failed: int
+    errors: int
+    duration_ms: int
+    latency_ms: dict[str, float]
+    timings_ms: dict[str, dict[str, float]]
+    results: list[RunResult]
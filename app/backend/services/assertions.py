@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable
+
+try:
+    import jmespath
+except ImportError:
+    jmespath = None
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+MISSING = object()
+JSONPATH_TOKEN = re.compile(r"\.\.(\w+|\*)|\.(\w+|\*)|\[\s*(\*|-?\d+|'[^']*'|\"[^\"]*\")\s*\]")
+OPERATORS = frozenset(
+    {
+        "exists", "not_exists", "equals", "not_equals", "contains", "in",
+        "gt", "gte", "lt", "lte", "matches", "length", "type",
+    }
+)
+THRESHOLD_TYPES = frozenset({"latency", "duration_ms", "ttfb_ms", "size", "size_bytes"})
+JSON_TYPES = {"object": dict, "array": list, "string": str, "boolean": bool, "null": type(None)}
+
+Assertion = Callable[[dict], tuple[bool, str]]
+
+
+class InvalidAssertion(ValueError):
+    pass
+
+
+@lru_cache(maxsize=1024)
+def compile_jsonpath(expression: str) -> tuple[tuple[tuple[str, Any], ...], bool]:
+    expression = expression.strip()
+    if not expression.startswith("$"):
+        expression = "$." + expression
+    steps: list[tuple[str, Any]] = []
+    position = 1
+    for match in JSONPATH_TOKEN.finditer(expression, 1):
+        if match.start() != position:
+            break
+        descendant, child, bracket = match.groups()
+        if descendant is not None:
+            steps.append(("descendant", descendant))
+        elif child is not None:
+            steps.append(("wildcard", None) if child == "*" else ("key", child))
+        elif bracket == "*":
+            steps.append(("wildcard", None))
+        elif bracket[0] in "'\"":
+            steps.append(("key", bracket[1:-1]))
+        else:
+            steps.append(("index", int(bracket)))
+        position = match.end()
+    if position != len(expression):
+        raise InvalidAssertion(f"invalid JSONPath '{expression}' at position {position}")
+    multiple = any(kind in ("wildcard", "descendant") for kind, _ in steps)
+    return tuple(steps), multiple
+
+
+def _descendants(value: Any, name: str) -> list[Any]:
+    found = []
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if name == "*":
+                found.extend(current.values())
+            elif name in current:
+                found.append(current[name])
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            if name == "*":
+                found.extend(current)
+            stack.extend(reversed(current))
+    return found
+
+
+def evaluate_jsonpath(expression: str, document: Any) -> Any:
+    steps, multiple = compile_jsonpath(expression)
+    current = [document]
+    for kind, argument in steps:
+        following = []
+        for value in current:
+            if kind == "key" and isinstance(value, dict) and argument in value:
+                following.append(value[argument])
+            elif kind == "index" and isinstance(value, list) and -len(value) <= argument < len(value):
+                following.append(value[argument])
+            elif kind == "wildcard" and isinstance(value, dict):
+                following.extend(value.values())
+            elif kind == "wildcard" and isinstance(value, list):
+                following.extend(value)
+            elif kind == "descendant":
+                following.extend(_descendants(value, argument))
+        current = following
+    if multiple:
+        return current
+    return current[0] if current else MISSING
+
+
+@lru_cache(maxsize=1024)
+def _compile_regex(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=256)
+def _compile_jmespath(expression: str):
+    if jmespath is None:
+        raise InvalidAssertion("jmespath is not installed")
+    return jmespath.compile(expression)
+
+
+def _json_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    return next((name for name, kind in JSON_TYPES.items() if isinstance(value, kind)), "unknown")
+
+
+def _is_type(value: Any, expected: str) -> bool:
+    actual = _json_type(value)
+    return actual == expected or (expected == "number" and actual == "integer")
+
+
+def _schema_errors(schema: dict, value: Any, path: str = "$") -> list[str]:
+    errors: list[str] = []
+    expected_type = schema.get("type")
+    if expected_type is not None:
+        types = expected_type if isinstance(expected_type, list) else [expected_type]
+        if not any(_is_type(value, t) for t in types):
+            return [f"{path}: expected {'/'.join(types)}, got {_json_type(value)}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} not in enum")
+    if "const" in schema and value != schema["const"]:
+        errors.append(f"{path}: expected {schema['const']!r}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} < minimum {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} > maximum {schema['maximum']}")
+    if isinstance(value, str):
+        if "minLength" in schema and len(value) < schema["minLength"]:
+            errors.append(f"{path}: shorter than {schema['minLength']}")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{path}: longer than {schema['maxLength']}")
+        if "pattern" in schema and not _compile_regex(schema["pattern"]).search(value):
+            errors.append(f"{path}: does not match {schema['pattern']}")
+    if isinstance(value, dict):
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{path}: missing required '{name}'")
+        properties = schema.get("properties", {})
+        for name, item in value.items():
+            if name in properties:
+                errors.extend(_schema_errors(properties[name], item, f"{path}.{name}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected property '{name}'")
+    if isinstance(value, list):
+        if "minItems" in schema and len(value) < schema["minItems"]:
+            errors.append(f"{path}: fewer than {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{path}: more than {schema['maxItems']} items")
+        if isinstance(schema.get("items"), dict):
+            for index, item in enumerate(value):
+                errors.extend(_schema_errors(schema["items"], item, f"{path}[{index}]"))
+    return errors
+
+
+def _check_patterns(schema: Any) -> None:
+    if isinstance(schema, dict):
+        if isinstance(schema.get("pattern"), str):
+            _compile_regex(schema["pattern"])
+        for name in schema.get("patternProperties") or {}:
+            _compile_regex(name)
+        for value in schema.values():
+            _check_patterns(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            _check_patterns(value)
+
+
+@lru_cache(maxsize=256)
+def _compile_schema(schema_json: str) -> Callable[[Any], list[str]]:
+    schema = json.loads(schema_json)
+    _check_patterns(schema)
+    if jsonschema is not None:
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        return lambda value: [error.message for error in validator.iter_errors(value)]
+    return lambda value: _schema_errors(schema, value)
+
+
+def compare(op: str, actual: Any, expected: Any) -> bool:
+    if op == "exists":
+        return actual is not MISSING
+    if op == "not_exists":
+        return actual is MISSING
+    if actual is MISSING:
+        return False
+    if op == "equals":
+        return actual == expected
+    if op == "not_equals":
+        return actual != expected
+    if op == "contains":
+        return expected in actual if isinstance(actual, (str, list, dict)) else False
+    if op == "in":
+        return actual in expected
+    if op in ("gt", "gte", "lt", "lte"):
+        left, right = float(actual), float(expected)
+        return {"gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right}[op]
+    if op == "matches":
+        text = actual if isinstance(actual, str) else json.dumps(actual)
+        return _compile_regex(str(expected)).search(text) is not None
+    if op == "length":
+        return len(actual) == expected
+    if op == "type":
+        return _is_type(actual, expected)
+    raise InvalidAssertion(f"unknown operator '{op}'")
+
+
+def _describe(actual: Any) -> str:
+    return "missing" if actual is MISSING else json.dumps(actual, default=str)[:200]
+
+
+def _header_value(snapshot: dict, name: str) -> Any:
+    name = name.lower()
+    return next((v for k, v in (snapshot.get("headers") or {}).items() if k.lower() == name), MISSING)
+
+
+def _body_value(snapshot: dict) -> Any:
+    return snapshot.get("body")
+
+
+def _body_text(snapshot: dict) -> str:
+    body = snapshot.get("body")
+    if isinstance(body, (dict, list)):
+        return json.dumps(body, ensure_ascii=False)
+    return "" if body is None else str(body)
+
+
+def _extractor(test: dict) -> Callable[[dict], Any]:
+    test_type = test.get("type")
+    if test_type == "jsonpath":
+        path = test.get("path") or test.get("expression") or "$"
+        compile_jsonpath(path)
+        return lambda snapshot: evaluate_jsonpath(path, snapshot.get("body"))
+    if test_type == "jmespath":
+        expression = _compile_jmespath(test.get("expression") or "@")
+        return lambda snapshot: expression.search(snapshot.get("body"))
+    if test_type == "header":
+        name = test.get("name") or test.get("key") or ""
+        return lambda snapshot: _header_value(snapshot, name)
+    if test_type in ("latency", "duration_ms"):
+        return lambda snapshot: snapshot.get("duration_ms", MISSING)
+    if test_type == "ttfb_ms":
+        return lambda snapshot: snapshot.get("ttfb_ms", MISSING)
+    if test_type in ("size", "size_bytes"):
+        return lambda snapshot: snapshot.get("size_bytes", MISSING)
+    if test_type == "body":
+        return _body_text
+    raise InvalidAssertion("unknown test")
+
+
+def _compile(test: dict) -> Assertion:
+    test_type = test.get("type")
+    expected = test.get("expected")
+
+    if test_type == "status_code":
+        return lambda snapshot: (
+            snapshot.get("status_code") == expected,
+            f"expected {expected}, got {snapshot.get('status_code')}",
+        )
+    if test_type == "json_key":
+        key = test.get("key")
+
+        def _json_key(snapshot: dict) -> tuple[bool, str]:
+            body = snapshot.get("body")
+            if isinstance(body, dict) and key:
+                passed = key in body
+                return passed, f"key '{key}' present" if passed else f"missing key '{key}'"
+            return False, ""
+
+        return _json_key
+    if test_type == "equals":
+        actual = test.get("actual")
+        return lambda snapshot: (actual == expected, f"expected {expected}, got {actual}")
+    if test_type == "json_schema":
+        validate = _compile_schema(json.dumps(test.get("schema") or {}, sort_keys=True))
+        extract = _extractor({**test, "type": "jsonpath"}) if test.get("path") else _body_value
+
+        def _schema(snapshot: dict) -> tuple[bool, str]:
+            errors = validate(extract(snapshot))
+            return not errors, "; ".join(errors[:5]) if errors else "schema valid"
+
+        return _schema
+    if test_type == "regex":
+        pattern = _compile_regex(test.get("pattern") or str(expected or ""))
+        target = test.get("header")
+        extract = (lambda snapshot: _header_value(snapshot, target)) if target else _body_text
+
+        def _regex(snapshot: dict) -> tuple[bool, str]:
+            value = extract(snapshot)
+            passed = value is not MISSING and pattern.search(str(value)) is not None
+            return passed, f"/{pattern.pattern}/ {'matched' if passed else 'not found'}"
+
+        return _regex
+
+    extract = _extractor(test)
+    default_op = "lte" if test_type in THRESHOLD_TYPES else "equals"
+    op = test.get("op") or (default_op if "expected" in test else "exists")
+    if op not in OPERATORS:
+        raise InvalidAssertion(f"unknown operator '{op}'")
+    if op == "matches":
+        _compile_regex(str(expected))
+
+    def _extracted(snapshot: dict) -> tuple[bool, str]:
+        actual = extract(snapshot)
+        passed = compare(op, actual, expected)
+        if op in ("exists", "not_exists"):
+            return passed, f"{op}, got {_describe(actual)}"
+        return passed, f"{op} {_describe(expected)}, got {_describe(actual)}"
+
+    return _extracted
+
+
+@lru_cache(maxsize=4096)
+def _compile_cached(test_json: str) -> Assertion:
+    try:
+        return _compile(json.loads(test_json))
+    except Exception as exc:
+        message = str(exc) if isinstance(exc, InvalidAssertion) else f"{type(exc).__name__}: {exc}"
+        return lambda snapshot: (False, message)
+
+
+def compile_test(test: dict) -> Assertion:
+    return _compile_cached(json.dumps(test, sort_keys=True, default=str))
+
+
+def run_assertion(assertion: Assertion, snapshot: dict) -> tuple[bool, str]:
+    try:
+        return assertion(snapshot)
+    except (InvalidAssertion, ValueError, TypeError, KeyError, IndexError, re.error) as exc:
+        return False, f"{type(exc).__name__}: {exc}"
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import IO, Any, AsyncIterator, Iterator
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.database import SessionLocal
+from app.backend.models.blob import ResponseBlob
+from app.backend.models.history import History
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _codec() -> str:
+    if settings.blob_compression in ("auto", "zstd") and zstandard is not None:
+        return "zstd"
+    return "gzip"
+
+
+def compress(data: bytes) -> tuple[str, bytes]:
+    codec = _codec()
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor().compress(data)
+    return codec, gzip.compress(data, compresslevel=6)
+
+
+def compress_file(fileobj: IO[bytes]) -> tuple[str, bytes]:
+    codec = _codec()
+    if codec == "zstd":
+        compressor = zstandard.ZstdCompressor().compressobj()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    fileobj.seek(0)
+    parts: list[bytes] = []
+    while chunk := fileobj.read(READ_CHUNK_SIZE):
+        parts.append(compressor.compress(chunk))
+    parts.append(compressor.flush())
+    return codec, b"".join(parts)
+
+
+def iter_decompressed(codec: str, data: bytes) -> Iterator[bytes]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this blob")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj(wbits=31)
+    for offset in range(0, len(data), READ_CHUNK_SIZE):
+        chunk = decompressor.decompress(data[offset : offset + READ_CHUNK_SIZE])
+        if chunk:
+            yield chunk
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def encode_body(body: Any) -> tuple[str, bytes]:
+    if isinstance(body, (dict, list)):
+        return "json", json.dumps(body, ensure_ascii=False).encode("utf-8")
+    return "text", str(body).encode("utf-8")
+
+
+def decode_body(kind: str, raw: bytes) -> Any:
+    text = raw.decode("utf-8", errors="replace")
+    if kind == "json":
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+    return text
+
+
+def externalize_bodies(entries: list[tuple[dict, dict]]) -> tuple[list[tuple[dict, dict]], dict[str, tuple[str, bytes]]]:
+    blobs: dict[str, tuple[str, bytes]] = {}
+    externalized: list[tuple[dict, dict]] = []
+    for request_snapshot, response_snapshot in entries:
+        body = response_snapshot.get("body")
+        if body is None or isinstance(body, (int, float, bool)):
+            externalized.append((request_snapshot, response_snapshot))
+            continue
+        kind, raw = encode_body(body)
+        if len(raw) < settings.blob_threshold_bytes:
+            externalized.append((request_snapshot, response_snapshot))
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        blobs.setdefault(digest, (kind, raw))
+        response_snapshot = {
+            **response_snapshot,
+            "body": None,
+            "body_ref": {"digest": digest, "kind": kind, "size_bytes": len(raw)},
+        }
+        externalized.append((request_snapshot, response_snapshot))
+    return externalized, blobs
+
+
+async def store_blobs(db: AsyncSession, blobs: dict[str, tuple[str, bytes]]) -> dict[str, int]:
+    if not blobs:
+        return {}
+    result = await db.execute(
+        select(ResponseBlob.digest, ResponseBlob.stored_bytes).where(ResponseBlob.digest.in_(list(blobs)))
+    )
+    stored = {digest: stored_bytes for digest, stored_bytes in result}
+    missing = {digest: blob for digest, blob in blobs.items() if digest not in stored}
+    if not missing:
+        return stored
+
+    def _compress_all() -> list[dict[str, Any]]:
+        rows = []
+        for digest, (kind, raw) in missing.items():
+            codec, data = compress(raw)
+            rows.append(
+                {
+                    "digest": digest,
+                    "kind": kind,
+                    "compression": codec,
+                    "size_bytes": len(raw),
+                    "stored_bytes": len(data),
+                    "data": data,
+                }
+            )
+        return rows
+
+    rows = await asyncio.to_thread(_compress_all)
+    await db.execute(insert(ResponseBlob).on_conflict_do_nothing(index_elements=["digest"]), rows)
+    stored.update({row["digest"]: row["stored_bytes"] for row in rows})
+    return stored
+
+
+async def store_spilled_body(fileobj: IO[bytes], digest: str, kind: str, size_bytes: int) -> dict[str, Any]:
+    async with SessionLocal() as db:
+        exists_already = await db.scalar(select(ResponseBlob.digest).where(ResponseBlob.digest == digest))
+        if exists_already is not None:
+            await db.execute(
+                update(ResponseBlob).where(ResponseBlob.digest == digest).values(created_at=datetime.utcnow())
+            )
+            await db.commit()
+        else:
+            codec, data = await asyncio.to_thread(compress_file, fileobj)
+            await db.execute(
+                insert(ResponseBlob).on_conflict_do_nothing(index_elements=["digest"]),
+                {
+                    "digest": digest,
+                    "kind": kind,
+                    "compression": codec,
+                    "size_bytes": size_bytes,
+                    "stored_bytes": len(data),
+                    "data": data,
+                },
+            )
+            await db.commit()
+    return {"digest": digest, "kind": kind, "size_bytes": size_bytes}
+
+
+async def stream_blob(db: AsyncSession, digest: str) -> AsyncIterator[bytes] | None:
+    row = (
+        await db.execute(select(ResponseBlob.compression, ResponseBlob.data).where(ResponseBlob.digest == digest))
+    ).first()
+    if row is None:
+        return None
+    codec, data = row
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        for chunk in iter_decompressed(codec, data):
+            yield chunk
+            await asyncio.sleep(0)
+
+    return _chunks()
+
+
+async def load_body(db: AsyncSession, body_ref: dict) -> Any:
+    row = (
+        await db.execute(
+            select(ResponseBlob.compression, ResponseBlob.data).where(ResponseBlob.digest == body_ref["digest"])
+        )
+    ).first()
+    if row is None:
+        return None
+    codec, data = row
+    raw = await asyncio.to_thread(lambda: b"".join(iter_decompressed(codec, data)))
+    return decode_body(body_ref.get("kind", "text"), raw)
+
+
+async def collect_orphan_blobs(db: AsyncSession) -> int:
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.blob_orphan_grace_seconds)
+    result = await db.execute(
+        delete(ResponseBlob).where(
+            ResponseBlob.created_at < cutoff,
+            ~exists().where(History.body_digest == ResponseBlob.digest),
+        )
+    )
+    await db.commit()
+    return result.rowcount or 0
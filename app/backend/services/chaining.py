@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from app.backend.services.assertions import MISSING, evaluate_jsonpath
+from app.backend.services.variables import compile_template, template_variables
+
+
+def _as_variable(value: Any) -> str | None:
+    if value is MISSING or value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def extract_variables(rules: list[dict], response_snapshot: dict) -> dict[str, str]:
+    extracted: dict[str, str] = {}
+    for rule in rules:
+        source = rule.get("source", "body")
+        path = rule.get("path") or "$"
+        value: Any = MISSING
+        if source == "body":
+            try:
+                value = evaluate_jsonpath(path, response_snapshot.get("body"))
+            except ValueError:
+                continue
+        elif source == "header":
+            name = path.lower()
+            value = next((v for k, v in (response_snapshot.get("headers") or {}).items() if k.lower() == name), MISSING)
+        elif source == "status_code":
+            value = response_snapshot.get("status_code", MISSING)
+        elif source == "regex":
+            body = response_snapshot.get("body")
+            text = json.dumps(body, ensure_ascii=False) if isinstance(body, (dict, list)) else str(body or "")
+            try:
+                match = re.search(path, text)
+            except re.error:
+                continue
+            if match:
+                value = match.group(1) if match.groups() else match.group(0)
+        converted = _as_variable(value)
+        if converted is not None:
+            extracted[rule["variable"]] = converted
+    return extracted
+
+
+def spec_variables(spec: dict[str, Any]) -> set[str]:
+    names: set[str] = set()
+    for field in ("url", "headers", "params", "body"):
+        names |= template_variables(compile_template(spec.get(field)))
+    return names
+
+
+def build_dependency_graph(specs: list[dict[str, Any]]) -> list[dict[str, int]]:
+    producers: dict[str, int] = {}
+    graph: list[dict[str, int]] = []
+    for index, spec in enumerate(specs):
+        graph.append({name: producers[name] for name in spec_variables(spec) if name in producers})
+        for rule in spec.get("extract") or []:
+            producers[rule["variable"]] = index
+    return graph
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.models.environment import Environment
+
+ResolvedEnvironment = tuple[dict[str, str], str]
+_NO_ENVIRONMENT: ResolvedEnvironment = ({}, "")
+
+
+class EnvironmentCache:
+    def __init__(self):
+        self._entries: dict[int, ResolvedEnvironment] = {}
+        self._active_id: int | None = None
+        self._active_loaded = False
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, env_id: int) -> ResolvedEnvironment | None:
+        entry = self._entries.get(env_id)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        version = self._version
+        env = await db.get(Environment, env_id)
+        if not env:
+            return None
+        entry = (env.variables or {}, env.base_url or "")
+        if version == self._version:
+            self._entries[env_id] = entry
+        return entry
+
+    async def get_active(self, db: AsyncSession) -> ResolvedEnvironment:
+        if not self._active_loaded:
+            version = self._version
+            result = await db.execute(select(Environment.id).where(Environment.is_active.is_(True)).limit(1))
+            active_id = result.scalar_one_or_none()
+            if version == self._version:
+                self._active_id = active_id
+                self._active_loaded = True
+        else:
+            active_id = self._active_id
+        if active_id is None:
+            return _NO_ENVIRONMENT
+        return await self.get(db, active_id) or _NO_ENVIRONMENT
+
+    def invalidate(self, env_id: int | None = None) -> None:
+        self._version += 1
+        if env_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(env_id, None)
+        self._active_loaded = False
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "active_id": self._active_id if self._active_loaded else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+environment_cache = EnvironmentCache()
+
+
+async def resolve_environment(
+    db: AsyncSession, env_id: int | None, use_active: bool = False
+) -> ResolvedEnvironment | None:
+    if env_id is None:
+        return await environment_cache.get_active(db) if use_active else _NO_ENVIRONMENT
+    return await environment_cache.get(db, env_id)
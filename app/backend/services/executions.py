@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable
+
+_running: dict[str, asyncio.Task] = {}
+
+
+class ExecutionCancelled(Exception):
+    pass
+
+
+async def run_cancellable(execution_id: str | None, awaitable: Awaitable[Any]) -> Any:
+    if execution_id is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    _running[execution_id] = task
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if task.cancelled() and not asyncio.current_task().cancelling():
+            raise ExecutionCancelled(execution_id) from None
+        raise
+    finally:
+        _running.pop(execution_id, None)
+
+
+def cancel_execution(execution_id: str) -> bool:
+    task = _running.get(execution_id)
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
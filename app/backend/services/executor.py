@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Any
+
+from app.backend.models.request import Request
+from app.backend.services.http_client import execute_http_request
+from app.backend.services.tests import CompiledTests
+from app.backend.services.variables import compile_template
+
+COMPILED_FIELDS = ("method", "url", "headers", "params", "body_type", "body", "auth", "tests")
+COMPILED_SPEC_MAX_CHARS = 64 * 1024
+
+
+def request_spec(request: Request) -> dict[str, Any]:
+    return {
+        "id": request.id,
+        "name": request.name,
+        "method": request.method,
+        "url": request.url,
+        "headers": request.headers or {},
+        "params": request.params or {},
+        "body_type": request.body_type,
+        "body": request.body,
+        "auth": request.auth or {},
+        "tests": request.tests or [],
+        "extract": request.extract or [],
+    }
+
+
+def join_base_url(url: str, base_url: str) -> str:
+    if base_url and url.startswith("/"):
+        return base_url.rstrip("/") + url
+    if base_url and not url.startswith("http"):
+        return base_url.rstrip("/") + "/" + url.lstrip("/")
+    return url
+
+
+class CompiledRequest:
+    def __init__(self, spec: dict[str, Any], base_url: str):
+        self.method = spec.get("method", "GET")
+        self.base_url = base_url
+        self.body_type = spec.get("body_type", "none")
+        self.auth = spec.get("auth") or {}
+        self.url = compile_template(spec["url"])
+        self.headers = compile_template(spec.get("headers") or {})
+        self.params = compile_template(spec.get("params") or {})
+        self.body = compile_template(spec.get("body"))
+        self.tests = CompiledTests(spec.get("tests") or [])
+        self.is_static = all(t.is_static for t in (self.url, self.headers, self.params, self.body))
+
+    def render(self, variables: dict[str, str]) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": join_base_url(self.url.render(variables), self.base_url),
+            "headers": self.headers.render(variables),
+            "params": self.params.render(variables),
+            "body_type": self.body_type,
+            "body": self.body.render(variables),
+            "auth": self.auth,
+        }
+
+
+@lru_cache(maxsize=1024)
+def _compile_request(spec_json: str, base_url: str) -> CompiledRequest:
+    return CompiledRequest(json.loads(spec_json), base_url)
+
+
+def compile_request(spec: dict[str, Any], base_url: str) -> CompiledRequest:
+    spec_json = json.dumps({field: spec[field] for field in COMPILED_FIELDS if field in spec}, default=str)
+    if len(spec_json) > COMPILED_SPEC_MAX_CHARS:
+        return CompiledRequest(spec, base_url)
+    return _compile_request(spec_json, base_url)
+
+
+async def send_prepared(prepared: dict[str, Any], tests: CompiledTests) -> tuple[dict, dict]:
+    request_snapshot, response_snapshot = await execute_http_request(**prepared)
+    response_snapshot["tests"] = tests.run(response_snapshot)
+    return request_snapshot, response_snapshot
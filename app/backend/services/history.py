@@ -1,17 +1,224 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+import asyncio
+import json
+import logging
 
+from sqlalchemy import Delete, Select, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.database import SessionLocal
 from app.backend.models.history import History
+from app.backend.schemas.history import HistoryFilters
+from app.backend.services.blobs import externalize_bodies, store_blobs
+from app.backend.services.replay import snapshot_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _stored_bytes(request_snapshot: dict, response_snapshot: dict) -> int:
+    return len(json.dumps(request_snapshot, default=str)) + len(json.dumps(response_snapshot, default=str))
+
+
+SUMMARY_COLUMNS = (
+    History.id,
+    History.method,
+    History.url,
+    History.status_code,
+    History.duration_ms,
+    History.stored_bytes,
+    History.timings,
+    History.created_at,
+)
+
+
+def apply_history_filters(statement: Select | Delete, filters: HistoryFilters) -> Select | Delete:
+    if filters.method:
+        statement = statement.where(History.method == filters.method.upper())
+    if filters.url_prefix:
+        statement = statement.where(History.url >= filters.url_prefix, History.url < filters.url_prefix + "\U0010ffff")
+    if filters.status_code is not None:
+        statement = statement.where(History.status_code == filters.status_code)
+    if filters.since is not None:
+        statement = statement.where(History.created_at >= filters.since)
+    if filters.until is not None:
+        statement = statement.where(History.created_at < filters.until)
+    if filters.min_duration_ms is not None:
+        statement = statement.where(History.duration_ms >= filters.min_duration_ms)
+    return statement
+
 
+async def list_history_summaries(
+    db: AsyncSession, filters: HistoryFilters, cursor: int | None, limit: int
+) -> list[dict]:
+    statement = apply_history_filters(select(*SUMMARY_COLUMNS), filters)
+    if cursor is not None:
+        statement = statement.where(History.id < cursor)
+    result = await db.execute(statement.order_by(History.id.desc()).limit(limit))
+    return [dict(row._mapping) for row in result]
 
-def save_history(db: Session, request_snapshot: dict, response_snapshot: dict, duration_ms: int) -> History:
-    history = History(
+
+async def delete_history(db: AsyncSession, filters: HistoryFilters) -> int:
+    result = await db.execute(apply_history_filters(delete(History), filters))
+    await db.commit()
+    return result.rowcount or 0
+
+
+async def backfill_history_columns(conn: AsyncConnection) -> None:
+    await conn.execute(
+        update(History)
+        .where(History.method.is_(None))
+        .values(
+            method=func.upper(func.json_extract(History.request_snapshot, "$.method")),
+            url=func.json_extract(History.request_snapshot, "$.url"),
+            status_code=func.json_extract(History.response_snapshot, "$.status_code"),
+        )
+    )
+
+
+def _history_row(request_snapshot: dict, response_snapshot: dict, duration_ms: int, blob_bytes: int = 0) -> History:
+    body_ref = response_snapshot.get("body_ref") or {}
+    return History(
+        method=str(request_snapshot.get("method", "")).upper(),
+        url=request_snapshot.get("url"),
+        status_code=response_snapshot.get("status_code"),
         request_snapshot=request_snapshot,
         response_snapshot=response_snapshot,
         duration_ms=duration_ms,
+        stored_bytes=_stored_bytes(request_snapshot, response_snapshot) + blob_bytes,
+        body_digest=body_ref.get("digest"),
+        fingerprint=snapshot_fingerprint(request_snapshot),
+        timings=response_snapshot.get("timings"),
     )
+
+
+async def _history_rows(db: AsyncSession, entries: list[tuple[dict, dict]], duration_ms: int | None = None) -> list[History]:
+    entries, blobs = await asyncio.to_thread(externalize_bodies, entries)
+    blob_bytes = await store_blobs(db, blobs)
+    return [
+        _history_row(
+            request_snapshot,
+            response_snapshot,
+            response_snapshot["duration_ms"] if duration_ms is None else duration_ms,
+            blob_bytes.get((response_snapshot.get("body_ref") or {}).get("digest"), 0),
+        )
+        for request_snapshot, response_snapshot in entries
+    ]
+
+
+async def save_history(db: AsyncSession, request_snapshot: dict, response_snapshot: dict, duration_ms: int) -> History:
+    (history,) = await _history_rows(db, [(request_snapshot, response_snapshot)], duration_ms)
     db.add(history)
-    db.commit()
-    db.refresh(history)
+    await db.commit()
+    await db.refresh(history)
     return history
+
+
+async def save_history_batch(db: AsyncSession, entries: list[tuple[dict, dict]]) -> None:
+    db.add_all(await _history_rows(db, entries))
+    await db.commit()
+
+
+class HistoryWriter:
+    POLICIES = ("block", "drop_newest", "drop_oldest")
+
+    def __init__(
+        self,
+        max_queue: int = settings.history_queue_size,
+        batch_size: int = settings.history_batch_size,
+        flush_interval: float = settings.history_flush_interval_seconds,
+        overflow_policy: str = settings.history_overflow_policy,
+    ):
+        if overflow_policy not in self.POLICIES:
+            raise ValueError(f"unknown history overflow policy '{overflow_policy}'")
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.written = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if not task.done():
+            await self._queue.put(None)
+        await task
+        self._queue = None
+
+    async def submit(self, request_snapshot: dict, response_snapshot: dict) -> bool:
+        entry = (request_snapshot, response_snapshot)
+        if not self.running:
+            return await self._flush([entry])
+        if self.overflow_policy == "block":
+            await self._queue.put(entry)
+            return True
+        if self.overflow_policy == "drop_oldest":
+            while self._queue.full():
+                self._queue.get_nowait()
+                self.dropped += 1
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "overflow_policy": self.overflow_policy,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[dict, dict]]) -> bool:
+        try:
+            async with SessionLocal() as db:
+                await save_history_batch(db, batch)
+        except Exception:
+            logger.exception("failed to persist %d history entries", len(batch))
+            self.dropped += len(batch)
+            return False
+        self.written += len(batch)
+        return True
+
+
+history_writer = HistoryWriter()
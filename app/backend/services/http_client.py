@@ -1,13 +1,63 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import tempfile
 import time
-from typing import Any
+from contextlib import aclosing
+from typing import Any, AsyncIterator
 
 import httpx
 
 from app.backend.core.config import settings
 from app.backend.core.security import mask_secret
+from app.backend.services.blobs import store_spilled_body
+from app.backend.services.timing import RequestTimer, TimedNetworkBackend
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(
+    max_connections: int | None = None,
+    max_keepalive_connections: int | None = None,
+) -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=max_connections or settings.http_max_connections,
+            max_keepalive_connections=max_keepalive_connections or settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        http2=settings.http2_enabled and _http2_available(),
+    )
+    # httpx does not expose the httpcore network backend; wrap it to time DNS separately from connect.
+    transport._pool._network_backend = TimedNetworkBackend(transport._pool._network_backend)
+    return httpx.AsyncClient(timeout=settings.request_timeout_seconds, transport=transport)
+
+
+def init_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    return _client if _client is not None else init_http_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 def _apply_auth(headers: dict[str, str], params: dict[str, str], auth: dict) -> None:
@@ -41,7 +91,17 @@ def _prepare_body(body_type: str, body: Any) -> dict[str, Any]:
     return {}
 
 
-def execute_http_request(
+def _decode_body(content_type: str, encoding: str | None, data: bytes, truncated: bool) -> Any:
+    text = data.decode(encoding or "utf-8", errors="replace")
+    if "application/json" in content_type and not truncated:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+    return text
+
+
+async def iter_http_request(
     method: str,
     url: str,
     headers: dict[str, str],
@@ -49,40 +109,97 @@ def execute_http_request(
     body_type: str,
     body: Any,
     auth: dict,
-) -> tuple[dict, dict]:
+) -> AsyncIterator[tuple[str, Any]]:
     safe_headers = dict(headers)
     safe_params = dict(params)
     _apply_auth(safe_headers, safe_params, auth)
 
-    start = time.perf_counter()
-    with httpx.Client(timeout=settings.request_timeout_seconds) as client:
-        response = client.request(
-            method=method.upper(),
-            url=url,
-            headers=safe_headers,
-            params=safe_params,
-            **_prepare_body(body_type, body),
-        )
-    duration_ms = int((time.perf_counter() - start) * 1000)
-
-    response_headers = {k: v for k, v in response.headers.items()}
-    content_type = response.headers.get("content-type", "")
-
-    if "application/json" in content_type:
+    timer = RequestTimer()
+    client = get_http_client()
+    request = client.build_request(
+        method=method.upper(),
+        url=url,
+        headers=safe_headers,
+        params=safe_params,
+        extensions={"trace": timer.trace},
+        **_prepare_body(body_type, body),
+    )
+
+    max_buffer = settings.response_max_buffer_bytes
+    spill = settings.response_overflow_policy == "spill"
+    buffer = bytearray()
+    spill_file = None
+    digest = hashlib.sha256()
+    size_bytes = 0
+
+    try:
+        token = timer.activate()
         try:
-            body_out: Any = response.json()
-        except json.JSONDecodeError:
-            body_out = response.text
-    else:
-        body_out = response.text
+            response = await client.send(request, stream=True)
+        finally:
+            timer.deactivate(token)
+        try:
+            ttfb_ms = int(timer.ttfb_ms or (time.perf_counter() - timer.started_at) * 1000)
+            response_headers = {k: v for k, v in response.headers.items()}
+            yield "meta", {
+                "status_code": response.status_code,
+                "headers": response_headers,
+                "ttfb_ms": ttfb_ms,
+                "connection_reused": timer.connection_reused,
+                "http_version": response.http_version,
+            }
+            async for chunk in response.aiter_bytes():
+                size_bytes += len(chunk)
+                digest.update(chunk)
+                if spill_file is not None:
+                    spill_file.write(chunk)
+                elif len(buffer) + len(chunk) <= max_buffer:
+                    buffer.extend(chunk)
+                elif spill:
+                    spill_file = tempfile.TemporaryFile()
+                    spill_file.write(buffer)
+                    spill_file.write(chunk)
+                    buffer.clear()
+                else:
+                    buffer.extend(chunk[: max(max_buffer - len(buffer), 0)])
+                yield "chunk", chunk
+        finally:
+            await response.aclose()
+        timings = timer.summary()
+        duration_ms = int(timings["total_ms"])
+
+        content_type = response.headers.get("content-type", "")
+        truncated = size_bytes > max_buffer
+        body_ref = None
+        if spill_file is not None:
+            body_out = None
+            body_ref = await store_spilled_body(
+                spill_file,
+                digest.hexdigest(),
+                "json" if "application/json" in content_type else "text",
+                size_bytes,
+            )
+        else:
+            body_out = _decode_body(content_type, response.encoding, bytes(buffer), truncated)
+    finally:
+        if spill_file is not None:
+            spill_file.close()
 
     response_snapshot = {
         "status_code": response.status_code,
         "headers": response_headers,
         "body": body_out,
         "duration_ms": duration_ms,
-        "size_bytes": len(response.content),
+        "ttfb_ms": ttfb_ms,
+        "size_bytes": size_bytes,
+        "body_sha256": digest.hexdigest(),
+        "body_truncated": truncated and body_ref is None,
+        "timings": timings,
+        "connection_reused": timer.connection_reused,
+        "http_version": response.http_version,
     }
+    if body_ref is not None:
+        response_snapshot["body_ref"] = body_ref
 
     auth_masked = dict(auth)
     if auth_masked.get("token"):
@@ -102,4 +219,20 @@ def execute_http_request(
         "auth": auth_masked,
     }
 
-    return request_snapshot, response_snapshot
+    yield "done", (request_snapshot, response_snapshot)
+
+
+async def execute_http_request(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    params: dict[str, str],
+    body_type: str,
+    body: Any,
+    auth: dict,
+) -> tuple[dict, dict]:
+    async with aclosing(iter_http_request(method, url, headers, params, body_type, body, auth)) as events:
+        async for event, data in events:
+            if event == "done":
+                return data
+    raise RuntimeError("request finished without a response")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Any
+
+import httpx
+
+from app.backend.services.executor import CompiledRequest
+from app.backend.services.http_client import _apply_auth, _prepare_body, create_http_client
+from app.backend.services.stats import LatencyHistogram
+from app.backend.services.timing import PHASE_KEYS, RequestTimer
+
+
+def _scheduled_offset(index: int, rps: float, ramp_up_seconds: float) -> float:
+    ramp_count = rps * ramp_up_seconds / 2
+    if ramp_up_seconds and index < ramp_count:
+        return math.sqrt(2 * ramp_up_seconds * index / rps)
+    return ramp_up_seconds + (index - ramp_count) / rps
+
+
+def _build_send_args(prepared: dict[str, Any]) -> tuple[str, str, dict[str, Any]]:
+    headers = dict(prepared["headers"])
+    params = dict(prepared["params"])
+    _apply_auth(headers, params, prepared["auth"])
+    body_kwargs = _prepare_body(prepared["body_type"], prepared["body"])
+    return prepared["method"].upper(), prepared["url"], {"headers": headers, "params": params, **body_kwargs}
+
+
+async def run_load(
+    request: CompiledRequest,
+    variables: dict[str, str],
+    concurrency: int,
+    rps: float | None = None,
+    total_requests: int | None = None,
+    duration_seconds: float | None = None,
+    ramp_up_seconds: float = 0.0,
+) -> dict[str, Any]:
+    static_args = _build_send_args(request.render(variables)) if request.is_static else None
+
+    histogram = LatencyHistogram()
+    phase_histograms = {phase: LatencyHistogram() for phase in (*PHASE_KEYS, "ttfb_ms")}
+    status_codes: dict[str, int] = {}
+    errors: dict[str, int] = {}
+    totals = {"issued": 0, "bytes_sent": 0, "bytes_received": 0}
+
+    start = time.monotonic()
+    deadline = start + duration_seconds if duration_seconds else None
+
+    def _claim() -> bool:
+        if total_requests is not None and totals["issued"] >= total_requests:
+            return False
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        totals["issued"] += 1
+        return True
+
+    async def _send_one(client: httpx.AsyncClient) -> None:
+        timer = RequestTimer()
+        try:
+            method, url, send_kwargs = static_args or _build_send_args(request.render(variables))
+            outgoing = client.build_request(method, url, extensions={"trace": timer.trace}, **send_kwargs)
+            token = timer.activate()
+            try:
+                response = await client.send(outgoing, stream=True)
+            finally:
+                timer.deactivate(token)
+            try:
+                async for chunk in response.aiter_raw():
+                    totals["bytes_received"] += len(chunk)
+            finally:
+                await response.aclose()
+        except Exception as exc:
+            name = type(exc).__name__
+            errors[name] = errors.get(name, 0) + 1
+            return
+        timings = timer.summary()
+        histogram.record(int(timings["total_ms"] * 1000))
+        for phase, phase_histogram in phase_histograms.items():
+            phase_histogram.record(int(timings[phase] * 1000))
+        totals["bytes_sent"] += len(outgoing.content)
+        code = str(response.status_code)
+        status_codes[code] = status_codes.get(code, 0) + 1
+
+    async with create_http_client(max_connections=concurrency, max_keepalive_connections=concurrency) as client:
+        if rps:
+            semaphore = asyncio.Semaphore(concurrency)
+            tasks: set[asyncio.Task] = set()
+
+            async def _bounded() -> None:
+                try:
+                    await _send_one(client)
+                finally:
+                    semaphore.release()
+
+            index = 0
+            while True:
+                delay = start + _scheduled_offset(index, rps, ramp_up_seconds) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if not _claim():
+                    break
+                await semaphore.acquire()
+                task = asyncio.create_task(_bounded())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                index += 1
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+
+            async def _worker(position: int) -> None:
+                if ramp_up_seconds:
+                    await asyncio.sleep(ramp_up_seconds * position / concurrency)
+                while _claim():
+                    await _send_one(client)
+
+            await asyncio.gather(*(_worker(position) for position in range(concurrency)))
+
+    elapsed = time.monotonic() - start
+    completed = histogram.total
+    return {
+        "total": totals["issued"],
+        "completed": completed,
+        "errors": errors,
+        "status_codes": status_codes,
+        "duration_ms": int(elapsed * 1000),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "bytes_sent": totals["bytes_sent"],
+        "bytes_received": totals["bytes_received"],
+        "latency_ms": histogram.summary_ms(),
+        "timings_ms": {phase: phase_histogram.summary_ms() for phase, phase_histogram in phase_histograms.items()},
+        "histogram": histogram.buckets_ms(),
+    }
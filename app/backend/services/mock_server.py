@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import socket
+from typing import Any
+from urllib.parse import urlsplit
+
+import uvicorn
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.models.history import History
+from app.backend.models.request import Request
+from app.backend.services.blobs import load_body
+
+LEADING_VARIABLE = re.compile(r"^\{\{[^}]*\}\}")
+PATH_PARAMETER = re.compile(r"\{\{[^}]*\}\}|\{[^}/]*\}|:[A-Za-z_]\w*")
+SKIPPED_HEADERS = frozenset(
+    {"content-length", "content-encoding", "transfer-encoding", "connection", "keep-alive", "date", "server"}
+)
+EXAMPLE_SCAN_LIMIT = 5000
+NOT_FOUND_BODY = b'{"detail":"No mock route"}'
+INJECTED_ERROR_BODY = b'{"detail":"Injected error"}'
+JSON_HEADERS = [(b"content-type", b"application/json")]
+TEXT_CONTENT_TYPE = b"text/plain; charset=utf-8"
+
+
+def template_path(url: str) -> str:
+    url = LEADING_VARIABLE.sub("", url.strip())
+    path = urlsplit(url).path if "://" in url else url.split("?", 1)[0]
+    return "/" + path.lstrip("/")
+
+
+def compile_path(template: str) -> re.Pattern | None:
+    if not PATH_PARAMETER.search(template):
+        return None
+    parts = []
+    position = 0
+    for match in PATH_PARAMETER.finditer(template):
+        parts.append(re.escape(template[position : match.start()]))
+        parts.append("[^/]+")
+        position = match.end()
+    parts.append(re.escape(template[position:]))
+    return re.compile("".join(parts) + "$")
+
+
+def _latin1(value: Any) -> bytes:
+    return str(value).encode("latin-1", "replace")
+
+
+def _encode(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, (dict, list)):
+        return json.dumps(body, ensure_ascii=False).encode("utf-8")
+    return str(body).encode("utf-8")
+
+
+class MockRoute:
+    def __init__(
+        self, name: str, method: str, path: str, status_code: int, headers: dict[str, str], body: Any
+    ):
+        self.name = name
+        self.method = method.upper()
+        self.path = path
+        self.pattern = compile_path(path)
+        self.status_code = status_code
+        content = _encode(body)
+        response_headers = [
+            (_latin1(key.lower()), _latin1(value))
+            for key, value in headers.items()
+            if key.lower() not in SKIPPED_HEADERS
+        ]
+        if not any(name == b"content-type" for name, _ in response_headers):
+            content_type = b"application/json" if isinstance(body, (dict, list)) else TEXT_CONTENT_TYPE
+            response_headers.append((b"content-type", content_type))
+        response_headers.append((b"content-length", str(len(content)).encode("ascii")))
+        self.headers = response_headers
+        self.content = content
+        self.hits = 0
+
+
+async def _example_ids(db: AsyncSession, keys: list[tuple[str, str]]) -> dict[int, int]:
+    static: dict[tuple[str, str], list[int]] = {}
+    dynamic: list[tuple[int, str, re.Pattern]] = []
+    for index, (method, path) in enumerate(keys):
+        pattern = compile_path(path)
+        if pattern is None:
+            static.setdefault((method, path), []).append(index)
+        else:
+            dynamic.append((index, method, pattern))
+    result = await db.execute(
+        select(History.id, History.method, History.url)
+        .where(History.method.in_({method for method, _ in keys}), History.status_code.is_not(None))
+        .order_by(History.id.desc())
+        .limit(EXAMPLE_SCAN_LIMIT)
+    )
+    found: dict[int, int] = {}
+    for history_id, method, url in result:
+        recorded = urlsplit(url or "").path or "/"
+        for index in static.pop((method, recorded), []):
+            found[index] = history_id
+        for entry in [entry for entry in dynamic if entry[1] == method and entry[2].fullmatch(recorded)]:
+            found[entry[0]] = history_id
+            dynamic.remove(entry)
+        if not static and not dynamic:
+            break
+    return found
+
+
+async def build_routes(db: AsyncSession, collection_id: int) -> list[MockRoute]:
+    result = await db.execute(
+        select(Request.name, Request.method, Request.url)
+        .where(Request.collection_id == collection_id)
+        .order_by(Request.id)
+    )
+    requests = [(name, method.upper(), template_path(url)) for name, method, url in result]
+    found = await _example_ids(db, [(method, path) for _, method, path in requests])
+    snapshots = await db.execute(
+        select(History.id, History.response_snapshot).where(History.id.in_(set(found.values())))
+    )
+    responses = dict(snapshots.tuples().all())
+    routes = []
+    for index, (name, method, path) in enumerate(requests):
+        response = responses.get(found.get(index))
+        if response is None:
+            routes.append(MockRoute(name, method, path, 200, {}, {"mock": name}))
+            continue
+        body = response.get("body")
+        if response.get("body_ref"):
+            body = await load_body(db, response["body_ref"])
+        headers = response.get("headers") or {}
+        routes.append(MockRoute(name, method, path, response.get("status_code", 200), headers, body))
+    return routes
+
+
+class MockApp:
+    def __init__(
+        self,
+        routes: list[MockRoute],
+        latency_ms: float,
+        jitter_ms: float,
+        error_rate: float,
+        error_status: int,
+    ):
+        self.routes = routes
+        self.static = {(route.method, route.path): route for route in routes if route.pattern is None}
+        self.dynamic = [route for route in routes if route.pattern is not None]
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.served = 0
+        self.errors = 0
+        self.unmatched = 0
+
+    def match(self, method: str, path: str) -> MockRoute | None:
+        route = self.static.get((method, path))
+        if route is not None:
+            return route
+        for route in self.dynamic:
+            if route.method == method and route.pattern.match(path):
+                return route
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        route = self.match(scope["method"], scope["path"])
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        self.served += 1
+        if route is None:
+            self.unmatched += 1
+            await self._respond(send, 404, JSON_HEADERS, NOT_FOUND_BODY)
+            return
+        route.hits += 1
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            await self._respond(send, self.error_status, JSON_HEADERS, INJECTED_ERROR_BODY)
+            return
+        await self._respond(send, route.status_code, route.headers, route.content)
+
+    @staticmethod
+    async def _respond(send, status: int, headers: list[tuple[bytes, bytes]], content: bytes) -> None:
+        if not any(name == b"content-length" for name, _ in headers):
+            headers = [*headers, (b"content-length", str(len(content)).encode("ascii"))]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+
+class _EmbeddedServer(uvicorn.Server):
+    def install_signal_handlers(self) -> None:
+        pass
+
+
+class MockServer:
+    def __init__(self, server_id: int, collection_id: int, app: MockApp, host: str, port: int):
+        self.id = server_id
+        self.collection_id = collection_id
+        self.app = app
+        self.host = host
+        self.port = port
+        self._server = _EmbeddedServer(
+            uvicorn.Config(app, host=host, port=port, lifespan="off", log_level="warning", access_log=False)
+        )
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        self.port = sock.getsockname()[1]
+        self._task = asyncio.create_task(self._serve(sock))
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()
+                raise RuntimeError("mock server exited during startup")
+            await asyncio.sleep(0.01)
+
+    async def _serve(self, sock: socket.socket) -> None:
+        try:
+            await self._server.serve(sockets=[sock])
+        except SystemExit:
+            raise RuntimeError("mock server failed to start") from None
+        finally:
+            sock.close()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._server.should_exit = True
+        await self._task
+        self._task = None
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "collection_id": self.collection_id,
+            "url": f"http://{self.host}:{self.port}",
+            "latency_ms": self.app.latency_ms,
+            "jitter_ms": self.app.jitter_ms,
+            "error_rate": self.app.error_rate,
+            "error_status": self.app.error_status,
+            "served": self.app.served,
+            "errors": self.app.errors,
+            "unmatched": self.app.unmatched,
+            "routes": [
+                {
+                    "name": route.name,
+                    "method": route.method,
+                    "path": route.path,
+                    "status_code": route.status_code,
+                    "hits": route.hits,
+                }
+                for route in self.app.routes
+            ],
+        }
+
+
+class MockServerManager:
+    def __init__(self):
+        self._servers: dict[int, MockServer] = {}
+        self._next_id = 1
+
+    async def start(
+        self,
+        collection_id: int,
+        routes: list[MockRoute],
+        host: str,
+        port: int,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+    ) -> MockServer:
+        app = MockApp(routes, latency_ms, jitter_ms, error_rate, error_status)
+        server = MockServer(self._next_id, collection_id, app, host, port)
+        await server.start()
+        self._servers[server.id] = server
+        self._next_id += 1
+        return server
+
+    def get(self, server_id: int) -> MockServer | None:
+        return self._servers.get(server_id)
+
+    def servers(self) -> list[MockServer]:
+        return list(self._servers.values())
+
+    async def stop(self, server_id: int) -> bool:
+        server = self._servers.pop(server_id, None)
+        if server is None:
+            return False
+        await server.stop()
+        return True
+
+    async def stop_all(self) -> None:
+        for server_id in list(self._servers):
+            await self.stop(server_id)
+
+
+mock_servers = MockServerManager()
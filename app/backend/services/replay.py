@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from datetime import timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.models.history import History
+from app.backend.services.blobs import load_body
+from app.backend.services.http_client import _apply_auth
+
+KEY_HEADERS = frozenset(name.strip().lower() for name in settings.cache_key_headers.split(",") if name.strip())
+
+
+def request_fingerprint(
+    method: str, url: str, headers: dict[str, str], params: dict[str, str], body_type: str, body: Any
+) -> str:
+    body_bytes = body if isinstance(body, bytes) else json.dumps(body, sort_keys=True, default=str).encode("utf-8")
+    canonical = {
+        "method": method.upper(),
+        "url": url,
+        "params": sorted((str(k), str(v)) for k, v in (params or {}).items()),
+        "headers": sorted((k.lower(), v) for k, v in (headers or {}).items() if k.lower() in KEY_HEADERS),
+        "body_type": body_type,
+        "body": hashlib.sha256(body_bytes).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def snapshot_fingerprint(request_snapshot: dict) -> str:
+    return request_fingerprint(
+        str(request_snapshot.get("method", "")),
+        request_snapshot.get("url") or "",
+        request_snapshot.get("headers") or {},
+        request_snapshot.get("params") or {},
+        request_snapshot.get("body_type", "none"),
+        request_snapshot.get("body"),
+    )
+
+
+def prepared_fingerprint(prepared: dict[str, Any]) -> str:
+    headers = dict(prepared["headers"])
+    params = dict(prepared["params"])
+    _apply_auth(headers, params, prepared["auth"])
+    return request_fingerprint(
+        prepared["method"], prepared["url"], headers, params, prepared["body_type"], prepared["body"]
+    )
+
+
+def _cache_control(headers: dict[str, str]) -> dict[str, str]:
+    value = next((v for k, v in headers.items() if k.lower() == "cache-control"), "")
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def _header(headers: dict[str, str], name: str) -> str | None:
+    return next((v for k, v in headers.items() if k.lower() == name), None)
+
+
+class CachedResponse:
+    def __init__(self, response: dict, stored_at: float):
+        self.response = response
+        self.stored_at = stored_at
+
+    def lifetime(self, ttl: float | None) -> float:
+        directives = _cache_control(self.response.get("headers") or {})
+        if "no-store" in directives or "no-cache" in directives:
+            return 0.0
+        if ttl is not None:
+            return ttl
+        for name in ("s-maxage", "max-age"):
+            if directives.get(name, "").isdigit():
+                return float(directives[name])
+        return settings.cache_default_ttl_seconds
+
+    def is_fresh(self, ttl: float | None) -> bool:
+        return time.time() - self.stored_at < self.lifetime(ttl)
+
+    def validators(self) -> dict[str, str]:
+        headers = self.response.get("headers") or {}
+        conditional = {}
+        etag = _header(headers, "etag")
+        if etag:
+            conditional["If-None-Match"] = etag
+        last_modified = _header(headers, "last-modified")
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+        return conditional
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = settings.cache_max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: dict[str, CachedResponse] = {}
+
+    def _store(self, fingerprint: str, entry: CachedResponse) -> None:
+        self._entries.pop(fingerprint, None)
+        self._entries[fingerprint] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def remember(self, fingerprint: str, response: dict) -> None:
+        if "no-store" in _cache_control(response.get("headers") or {}) or response.get("body_truncated"):
+            return
+        self._store(fingerprint, CachedResponse(response, time.time()))
+
+    def refresh(self, fingerprint: str) -> None:
+        entry = self._entries.get(fingerprint)
+        if entry is not None:
+            entry.stored_at = time.time()
+            self.revalidated += 1
+
+    async def lookup(self, db: AsyncSession, fingerprint: str) -> CachedResponse | None:
+        entry = self._entries.pop(fingerprint, None)
+        if entry is not None:
+            self._entries[fingerprint] = entry
+            self.hits += 1
+            return entry
+        row = (
+            await db.execute(
+                select(History.response_snapshot, History.created_at)
+                .where(History.fingerprint == fingerprint, History.status_code < 500)
+                .order_by(History.id.desc())
+                .limit(1)
+            )
+        ).first()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        response, created_at = row
+        if response.get("body_ref"):
+            response = {**response, "body": await load_body(db, response["body_ref"])}
+        entry = CachedResponse(response, created_at.replace(tzinfo=timezone.utc).timestamp())
+        self._store(fingerprint, entry)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.database import SessionLocal, engine
+from app.backend.models.blob import ResponseBlob
+from app.backend.models.history import History
+from app.backend.services.blobs import collect_orphan_blobs
+
+logger = logging.getLogger(__name__)
+
+AUTO_VACUUM_MODES = {"none": 0, "full": 1, "incremental": 2}
+
+
+async def _prune_boundary(db: AsyncSession) -> int | None:
+    boundaries: list[int] = []
+    if settings.history_max_items > 0:
+        boundary = await db.scalar(
+            select(History.id).order_by(History.id.desc()).offset(settings.history_max_items).limit(1)
+        )
+        if boundary is not None:
+            boundaries.append(boundary)
+    if settings.history_max_age_days > 0:
+        cutoff = datetime.utcnow() - timedelta(days=settings.history_max_age_days)
+        boundary = await db.scalar(select(func.max(History.id)).where(History.created_at < cutoff))
+        if boundary is not None:
+            boundaries.append(boundary)
+    if settings.history_max_bytes > 0:
+        newest = (
+            select(History.body_digest, func.max(History.id).label("id"))
+            .where(History.body_digest.is_not(None))
+            .group_by(History.body_digest)
+        ).subquery()
+        shared_blob_bytes = case(
+            (newest.c.id != History.id, func.coalesce(ResponseBlob.stored_bytes, 0)),
+            else_=0,
+        )
+        footprint = func.coalesce(History.stored_bytes, 0) - shared_blob_bytes
+        running = (
+            select(History.id, func.sum(footprint).over(order_by=History.id.desc()).label("running"))
+            .outerjoin(newest, newest.c.body_digest == History.body_digest)
+            .outerjoin(ResponseBlob, ResponseBlob.digest == History.body_digest)
+        ).subquery()
+        boundary = await db.scalar(
+            select(func.max(running.c.id)).where(running.c.running > settings.history_max_bytes)
+        )
+        if boundary is not None:
+            boundaries.append(boundary)
+    return max(boundaries) if boundaries else None
+
+
+async def prune_history(db: AsyncSession) -> int:
+    boundary = await _prune_boundary(db)
+    if boundary is None:
+        return 0
+    low = await db.scalar(select(func.min(History.id)))
+    deleted = 0
+    while low is not None and low <= boundary:
+        high = min(low + settings.history_prune_batch_size - 1, boundary)
+        result = await db.execute(delete(History).where(History.id.between(low, high)))
+        await db.commit()
+        deleted += result.rowcount or 0
+        low = high + 1
+        await asyncio.sleep(0)
+    return deleted
+
+
+async def _vacuum(statement: str) -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        raw = await conn.get_raw_connection()
+        try:
+            await raw.driver_connection.executescript(statement)
+        except sqlite3.Error as exc:
+            logger.warning("%s skipped: %s", statement, exc)
+
+
+async def ensure_auto_vacuum() -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    wanted = AUTO_VACUUM_MODES.get(settings.sqlite_auto_vacuum.lower(), 0)
+    async with engine.connect() as conn:
+        current = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+    if current == wanted:
+        return
+    if not settings.sqlite_auto_vacuum_rebuild:
+        logger.info(
+            "auto_vacuum=%s is pending until the database is rebuilt; set sqlite_auto_vacuum_rebuild to apply it",
+            settings.sqlite_auto_vacuum,
+        )
+        return
+    await _vacuum("VACUUM")
+
+
+async def reclaim_space() -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    if settings.history_vacuum_after_prune:
+        await _vacuum("VACUUM")
+    elif settings.sqlite_auto_vacuum.lower() == "incremental":
+        await _vacuum(f"PRAGMA incremental_vacuum({settings.sqlite_incremental_vacuum_pages})")
+
+
+class HistoryPruner:
+    def __init__(self, interval: float = settings.history_prune_interval_seconds):
+        self.interval = interval
+        self.pruned = 0
+        self.last_run: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def run_once(self) -> int:
+        async with SessionLocal() as db:
+            deleted = await prune_history(db)
+            await collect_orphan_blobs(db)
+        if deleted:
+            await reclaim_space()
+        self.pruned += deleted
+        self.last_run = datetime.utcnow()
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("history pruning failed")
+
+
+history_pruner = HistoryPruner()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from app.backend.services.chaining import build_dependency_graph, extract_variables
+from app.backend.services.executor import compile_request, send_prepared
+from app.backend.services.stats import latency_summary
+from app.backend.services.timing import PHASE_KEYS
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    def __init__(self, default_rps: float = 0.0, host_rps: dict[str, float] | None = None):
+        self.default_rps = default_rps
+        self.host_rps = host_rps or {}
+        self._next_slot: dict[str, float] = {}
+
+    def _interval(self, host: str) -> float:
+        rps = self.host_rps.get(host, self.default_rps)
+        return 1.0 / rps if rps > 0 else 0.0
+
+    async def acquire(self, host: str) -> None:
+        interval = self._interval(host)
+        if not interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def run_specs(
+    specs: list[dict[str, Any]],
+    variables: dict[str, str],
+    base_url: str,
+    concurrency: int,
+    limiter: HostRateLimiter,
+) -> list[dict[str, Any]]:
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    graph = build_dependency_graph(specs)
+    extracted: list[dict[str, str]] = [{} for _ in specs]
+    tasks: list[asyncio.Task] = []
+
+    async def _run_one(index: int, spec: dict[str, Any]) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "request_id": spec.get("id"),
+            "name": spec.get("name", ""),
+            "method": spec.get("method", "GET"),
+            "url": spec.get("url", ""),
+            "status_code": None,
+            "duration_ms": None,
+            "passed": False,
+            "tests": [],
+            "timings": None,
+            "extracted": {},
+            "error": None,
+        }
+        scope = variables
+        dependencies = graph[index]
+        if dependencies:
+            await asyncio.gather(*(tasks[producer] for producer in set(dependencies.values())))
+            scope = dict(variables)
+            for name, producer in dependencies.items():
+                if name not in extracted[producer]:
+                    result["error"] = f"Skipped: '{specs[producer].get('name', '')}' did not provide '{name}'"
+                    return result
+                scope[name] = extracted[producer][name]
+        try:
+            compiled = compile_request(spec, base_url)
+            prepared = compiled.render(scope)
+            result["url"] = prepared["url"]
+            await limiter.acquire(httpx.URL(prepared["url"]).host)
+            async with semaphore:
+                request_snapshot, response_snapshot = await send_prepared(prepared, compiled.tests)
+            extracted[index] = extract_variables(spec.get("extract") or [], response_snapshot)
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            result["error"] = f"{type(exc).__name__}: {exc}"
+            return result
+        except Exception as exc:
+            logger.exception("collection request '%s' failed", result["name"])
+            result["error"] = f"{type(exc).__name__}: {exc}"
+            return result
+
+        tests = response_snapshot["tests"]
+        result.update(
+            status_code=response_snapshot["status_code"],
+            duration_ms=response_snapshot["duration_ms"],
+            passed=all(test["passed"] for test in tests),
+            tests=tests,
+            timings=response_snapshot.get("timings"),
+            extracted=extracted[index],
+            snapshots=(request_snapshot, response_snapshot),
+        )
+        return result
+
+    tasks.extend(asyncio.create_task(_run_one(index, spec)) for index, spec in enumerate(specs))
+    return await asyncio.gather(*tasks)
+
+
+def build_report(results: list[dict[str, Any]], elapsed_ms: int) -> dict[str, Any]:
+    errors = sum(1 for result in results if result["error"])
+    passed = sum(1 for result in results if result["passed"])
+    timed = [result["timings"] for result in results if result["timings"]]
+    return {
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed - errors,
+        "errors": errors,
+        "duration_ms": elapsed_ms,
+        "latency_ms": latency_summary([r["duration_ms"] for r in results if r["duration_ms"] is not None]),
+        "timings_ms": {
+            phase: latency_summary([timings.get(phase, 0.0) for timings in timed])
+            for phase in (*PHASE_KEYS, "ttfb_ms")
+        },
+        "results": [{k: v for k, v in result.items() if k != "snapshots"} for result in results],
+    }
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import JSON, bindparam, select, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.backend.core.config import settings
+from app.backend.core.security import ENCRYPTED_PREFIX, EncryptedJSON, is_current_token, rotate_key
+from app.backend.models import Environment, Request
+
+ENCRYPTED_COLUMNS = [(Environment, "variables"), (Request, "auth")]
+
+
+def _needs_encryption(raw: Any) -> bool:
+    if not (isinstance(raw, str) and raw.startswith(ENCRYPTED_PREFIX)):
+        return True
+    return not is_current_token(raw[len(ENCRYPTED_PREFIX) :])
+
+
+async def encrypt_stored_secrets(conn: AsyncConnection) -> int:
+    if settings.secret_rotate_on_startup:
+        rotate_key()
+    decoder = EncryptedJSON()
+    updated = 0
+    for model, name in ENCRYPTED_COLUMNS:
+        table = model.__table__
+        column = table.c[name]
+        rows = (await conn.execute(select(table.c.id, type_coerce(column, JSON).label("raw")))).all()
+        params = [
+            {"row_id": row.id, "value": decoder.process_result_value(row.raw, None)}
+            for row in rows
+            if row.raw is not None and _needs_encryption(row.raw)
+        ]
+        if params:
+            await conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values({name: bindparam("value")}),
+                params,
+            )
+            updated += len(params)
+    return updated
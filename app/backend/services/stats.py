@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+
+
+def percentile(sorted_values: list[int], pct: float) -> int:
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def latency_summary(values: list[int]) -> dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"min": 0, "mean": 0, "p50": 0, "p90": 0, "p95": 0, "p99": 0, "max": 0}
+    return {
+        "min": ordered[0],
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "p50": percentile(ordered, 50),
+        "p90": percentile(ordered, 90),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1],
+    }
+
+
+class LatencyHistogram:
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        shift = max(value_us.bit_length() - self.SUB_BUCKET_BITS - 1, 0)
+        return (shift << (self.SUB_BUCKET_BITS + 1)) | (value_us >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        shift = index >> (self.SUB_BUCKET_BITS + 1)
+        mantissa = index & ((1 << (self.SUB_BUCKET_BITS + 1)) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        value_us = max(int(value_us), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def value_at_percentile(self, pct: float) -> int:
+        if not self.total:
+            return 0
+        rank = max(math.ceil(pct / 100 * self.total), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max_us)
+        return self.max_us
+
+    def summary_ms(self) -> dict[str, float]:
+        def _ms(value_us: int) -> float:
+            return round(value_us / 1000, 3)
+
+        return {
+            "min": _ms(self.min_us or 0),
+            "mean": _ms(self.sum_us // self.total) if self.total else 0.0,
+            "p50": _ms(self.value_at_percentile(50)),
+            "p90": _ms(self.value_at_percentile(90)),
+            "p99": _ms(self.value_at_percentile(99)),
+            "p999": _ms(self.value_at_percentile(99.9)),
+            "max": _ms(self.max_us),
+        }
+
+    def buckets_ms(self) -> list[dict[str, float]]:
+        return [
+            {"upper_ms": round(self._upper_bound(index) / 1000, 3), "count": self.counts[index]}
+            for index in sorted(self.counts)
+        ]
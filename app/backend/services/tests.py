@@ -1,34 +1,22 @@
 from __future__ import annotations
 
-from typing import Any
+from app.backend.services.assertions import Assertion, compile_test, run_assertion
 
 
-def run_tests(tests: list[dict], response_snapshot: dict) -> list[dict]:
-    results: list[dict] = []
-    status = response_snapshot.get("status_code")
-    body = response_snapshot.get("body")
-
-    for test in tests:
-        test_type = test.get("type")
-        expected = test.get("expected")
-        passed = False
-        message = ""
+class CompiledTests:
+    def __init__(self, tests: list[dict]):
+        self.assertions: list[tuple[dict, Assertion]] = [(test, compile_test(test)) for test in tests]
 
-        if test_type == "status_code":
-            passed = status == expected
-            message = f"expected {expected}, got {status}"
-        elif test_type == "json_key":
-            key = test.get("key")
-            if isinstance(body, dict) and key:
-                passed = key in body
-                message = f"key '{key}' present" if passed else f"missing key '{key}'"
-        elif test_type == "equals":
-            actual = test.get("actual")
-            passed = actual == expected
-            message = f"expected {expected}, got {actual}"
-        else:
-            message = "unknown test"
+    def run(self, response_snapshot: dict) -> list[dict]:
+        results: list[dict] = []
+        for test, assertion in self.assertions:
+            passed, message = run_assertion(assertion, response_snapshot)
+            result = {"type": test.get("type"), "passed": passed, "message": message}
+            if test.get("name"):
+                result["name"] = test["name"]
+            results.append(result)
+        return results
 
-        results.append({"type": test_type, "passed": passed, "message": message})
 
-    return results
+def run_tests(tests: list[dict], response_snapshot: dict) -> list[dict]:
+    return CompiledTests(tests).run(response_snapshot)
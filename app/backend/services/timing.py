@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+import typing
+from contextvars import ContextVar
+
+import httpcore
+
+PHASE_KEYS = ("dns_ms", "connect_ms", "tls_ms", "request_write_ms", "wait_ms", "download_ms")
+
+TRACE_PHASES = {
+    "connect_tcp": "connect_ms",
+    "start_tls": "tls_ms",
+    "send_request_headers": "request_write_ms",
+    "send_request_body": "request_write_ms",
+    "receive_response_headers": "wait_ms",
+    "receive_response_body": "download_ms",
+}
+
+_current_timer: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.connection_reused = True
+        self.ttfb_ms: float | None = None
+        self.phases = dict.fromkeys(PHASE_KEYS, 0.0)
+        self._open: dict[str, float] = {}
+
+    def activate(self):
+        return _current_timer.set(self)
+
+    @staticmethod
+    def deactivate(token) -> None:
+        _current_timer.reset(token)
+
+    async def trace(self, event_name: str, info: dict) -> None:
+        scope, _, stage = event_name.rpartition(".")
+        step = scope.rpartition(".")[2]
+        if step == "connect_tcp" and stage == "started":
+            self.connection_reused = False
+        if step not in TRACE_PHASES:
+            return
+        now = time.perf_counter()
+        if stage == "started":
+            self._open[step] = now
+        elif step in self._open:
+            self.phases[TRACE_PHASES[step]] += (now - self._open.pop(step)) * 1000
+            if step == "receive_response_headers":
+                self.ttfb_ms = (now - self.started_at) * 1000
+
+    def record_dns(self, elapsed_ms: float) -> None:
+        self.phases["dns_ms"] += elapsed_ms
+
+    def summary(self) -> dict[str, float]:
+        phases = dict(self.phases)
+        phases["connect_ms"] = max(phases["connect_ms"] - phases["dns_ms"], 0.0)
+        phases["ttfb_ms"] = self.ttfb_ms or 0.0
+        phases["total_ms"] = (time.perf_counter() - self.started_at) * 1000
+        return {key: round(value, 3) for key, value in phases.items()}
+
+
+class TimedNetworkBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: typing.Iterable[typing.Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        timer = _current_timer.get()
+        if timer is None:
+            return await self._backend.connect_tcp(
+                host, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+            )
+
+        start = time.perf_counter()
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise httpcore.ConnectTimeout(f"DNS lookup for {host} timed out") from exc
+        except OSError as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        finally:
+            timer.record_dns((time.perf_counter() - start) * 1000)
+
+        last_error: Exception | None = None
+        for address in dict.fromkeys(info[4][0] for info in infos):
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_error = exc
+        raise last_error or httpcore.ConnectError(f"no addresses found for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: typing.Iterable[typing.Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
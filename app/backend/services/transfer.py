@@ -0,0 +1,468 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from typing import IO, Any, AsyncIterator, Callable, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.database import SessionLocal
+from app.backend.models.collection import Collection
+from app.backend.models.request import Request
+from app.backend.schemas.request import AuthConfig
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+SKIPPED_HAR_HEADERS = frozenset({"host", "content-length", "connection"})
+PATH_PARAMETER = re.compile(r"\{([^{}]+)\}")
+YAML_OPENAPI = re.compile(r"^['\"]?(openapi|swagger)['\"]?\s*:", re.MULTILINE)
+SNIFF_BYTES = 64 * 1024
+OPENAPI_BASE_PATHS = (("servers",), ("host",), ("schemes",), ("basePath",))
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class JsonSource:
+    def __init__(self, fileobj: IO[bytes], document: Any = None):
+        self.fileobj = fileobj
+        self._document = document
+        self._streaming = ijson is not None and document is None
+
+    @classmethod
+    def from_yaml(cls, fileobj: IO[bytes]) -> JsonSource:
+        if yaml is None:
+            raise ImportFormatError("YAML import requires PyYAML")
+        fileobj.seek(0)
+        return cls(fileobj, yaml.safe_load(fileobj))
+
+    def _load(self) -> Any:
+        if self._document is None:
+            self.fileobj.seek(0)
+            self._document = json.load(self.fileobj)
+        return self._document
+
+    def _lookup(self, path: tuple[str, ...]) -> Any:
+        value = self._load()
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    def value(self, path: tuple[str, ...], default: Any = None) -> Any:
+        value = self.values([path])[path]
+        return default if value is None else value
+
+    def values(self, paths: list[tuple[str, ...]]) -> dict[tuple[str, ...], Any]:
+        if not self._streaming:
+            return {path: self._lookup(path) for path in paths}
+        wanted = {".".join(path): path for path in paths}
+        found: dict[tuple[str, ...], Any] = dict.fromkeys(paths)
+        active: str | None = None
+        builder = None
+        self.fileobj.seek(0)
+        for prefix, event, value in ijson.parse(self.fileobj, use_float=True):
+            if active is not None:
+                builder.event(event, value)
+                if prefix == active and event in ("end_map", "end_array"):
+                    found[wanted.pop(active)] = builder.value
+                    active = None
+            elif prefix in wanted and event in ("start_map", "start_array"):
+                active, builder = prefix, ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in wanted and event != "map_key":
+                found[wanted.pop(prefix)] = value
+            if not wanted:
+                break
+        return found
+
+    def array(self, path: tuple[str, ...]) -> Iterator[Any]:
+        if not self._streaming:
+            yield from self._lookup(path) or []
+            return
+        self.fileobj.seek(0)
+        yield from ijson.items(self.fileobj, ".".join((*path, "item")), use_float=True)
+
+    def object(self, path: tuple[str, ...]) -> Iterator[tuple[str, Any]]:
+        if not self._streaming:
+            yield from (self._lookup(path) or {}).items()
+            return
+        self.fileobj.seek(0)
+        yield from ijson.kvitems(self.fileobj, ".".join(path), use_float=True)
+
+
+def detect_format(fileobj: IO[bytes]) -> str:
+    fileobj.seek(0)
+    head = fileobj.read(SNIFF_BYTES).decode("utf-8", errors="ignore")
+    if re.search(r'"(openapi|swagger)"\s*:', head) or YAML_OPENAPI.search(head):
+        return "openapi"
+    if re.search(r'"log"\s*:', head):
+        return "har"
+    if re.search(r'"(item|info)"\s*:', head):
+        return "postman"
+    raise ImportFormatError("could not detect import format; pass format=postman|openapi|har")
+
+
+def _split_query(url: str) -> tuple[str, dict[str, str]]:
+    base, _, query = url.partition("?")
+    return base, dict(parse_qsl(query, keep_blank_values=True))
+
+
+def _pairs(entries: Any, key: str = "key") -> dict[str, str]:
+    return {
+        str(entry[key]): str(entry.get("value") or "")
+        for entry in entries or []
+        if isinstance(entry, dict) and entry.get(key) and not entry.get("disabled")
+    }
+
+
+def _json_or_raw(text: str, is_json: bool) -> tuple[str, Any]:
+    if is_json:
+        try:
+            return "json", json.loads(text)
+        except ValueError:
+            pass
+    return "raw", text
+
+
+def _row(
+    name: str,
+    method: str,
+    url: str,
+    headers: dict,
+    params: dict,
+    body_type: str,
+    body: Any,
+    auth: dict | None = None,
+) -> dict:
+    return {
+        "name": (name or f"{method.upper()} {url}")[:150],
+        "method": method.upper(),
+        "url": url,
+        "headers": headers,
+        "params": params,
+        "body_type": body_type,
+        "body": body,
+        "auth": auth if auth is not None else AuthConfig().model_dump(by_alias=True),
+        "tests": [],
+        "extract": [],
+    }
+
+
+def _postman_auth(auth: dict) -> dict:
+    auth_type = auth.get("type")
+    values = _pairs(auth.get(auth_type)) if auth_type else {}
+    if auth_type == "bearer":
+        config = AuthConfig(type="bearer", token=values.get("token"))
+    elif auth_type == "basic":
+        config = AuthConfig(type="basic", username=values.get("username"), password=values.get("password"))
+    elif auth_type == "apikey":
+        config = AuthConfig.model_validate(
+            {
+                "type": "api_key",
+                "key": values.get("key"),
+                "value": values.get("value"),
+                "in": values.get("in", "header"),
+            }
+        )
+    else:
+        config = AuthConfig()
+    return config.model_dump(by_alias=True)
+
+
+def _postman_body(body: dict, headers: dict[str, str]) -> tuple[str, Any]:
+    mode = body.get("mode")
+    if mode == "raw":
+        language = ((body.get("options") or {}).get("raw") or {}).get("language")
+        content_type = next((v for k, v in headers.items() if k.lower() == "content-type"), "")
+        return _json_or_raw(body.get("raw") or "", language == "json" or "json" in content_type)
+    if mode in ("urlencoded", "formdata"):
+        return "form", _pairs(body.get(mode))
+    return "none", None
+
+
+def _postman_request(name: str, request: Any) -> dict:
+    if isinstance(request, str):
+        request = {"url": request}
+    url = request.get("url") or ""
+    if isinstance(url, dict):
+        params = _pairs(url.get("query"))
+        raw = url.get("raw") or ""
+        if raw:
+            url = raw.partition("?")[0]
+        else:
+            url = "/".join(url.get("host") or []) + "/" + "/".join(url.get("path") or [])
+    else:
+        url, params = _split_query(url)
+    headers = _pairs(request.get("header"))
+    body_type, body = _postman_body(request.get("body") or {}, headers)
+    auth = _postman_auth(request.get("auth") or {})
+    return _row(name, request.get("method") or "GET", url, headers, params, body_type, body, auth)
+
+
+def _postman_items(items: list[dict], prefix: str = "") -> Iterator[dict]:
+    for item in items:
+        name = f"{prefix}{item.get('name') or ''}"
+        if isinstance(item.get("item"), list):
+            yield from _postman_items(item["item"], f"{name} / ")
+        elif "request" in item:
+            yield _postman_request(name, item["request"])
+
+
+def postman_rows(source: JsonSource) -> tuple[str, Iterator[dict]]:
+    title = source.value(("info", "name"), "Postman import")
+    return title, (row for item in source.array(("item",)) for row in _postman_items([item]))
+
+
+def _openapi_base(values: dict[tuple[str, ...], Any]) -> str:
+    servers = values[("servers",)]
+    if servers and isinstance(servers[0], dict) and servers[0].get("url"):
+        return servers[0]["url"].rstrip("/")
+    host = values[("host",)]
+    if host:
+        scheme = (values[("schemes",)] or ["https"])[0]
+        return f"{scheme}://{host}{(values[('basePath',)] or '').rstrip('/')}"
+    return "{{baseUrl}}"
+
+
+def _openapi_example(media: dict) -> Any:
+    if "example" in media:
+        return media["example"]
+    examples = media.get("examples") or {}
+    for example in examples.values():
+        if isinstance(example, dict) and "value" in example:
+            return example["value"]
+    return (media.get("schema") or {}).get("example", {})
+
+
+def _openapi_operation(base: str, path: str, method: str, shared: list, operation: dict) -> dict:
+    headers: dict[str, str] = {}
+    params: dict[str, str] = {}
+    body_type, body = "none", None
+    for parameter in [*shared, *(operation.get("parameters") or [])]:
+        if not isinstance(parameter, dict) or "name" not in parameter:
+            continue
+        location = parameter.get("in")
+        default = (parameter.get("schema") or {}).get("default", parameter.get("default", ""))
+        value = parameter.get("example", default)
+        value = value if isinstance(value, str) else json.dumps(value)
+        if location == "query":
+            params[parameter["name"]] = value
+        elif location == "header":
+            headers[parameter["name"]] = value
+        elif location == "body":
+            body_type, body = "json", (parameter.get("schema") or {}).get("example", {})
+    content = (operation.get("requestBody") or {}).get("content") or {}
+    if "application/json" in content:
+        body_type, body = "json", _openapi_example(content["application/json"])
+    elif "application/x-www-form-urlencoded" in content:
+        body_type, body = "form", {}
+    if body_type == "json":
+        headers.setdefault("Content-Type", "application/json")
+    url = base + PATH_PARAMETER.sub(r"{{\1}}", path)
+    name = operation.get("operationId") or operation.get("summary") or f"{method.upper()} {path}"
+    return _row(name, method, url, headers, params, body_type, body)
+
+
+def openapi_rows(source: JsonSource) -> tuple[str, Iterator[dict]]:
+    values = source.values([("info", "title"), *OPENAPI_BASE_PATHS])
+    title = values[("info", "title")] or "OpenAPI import"
+    base = _openapi_base(values)
+
+    def _rows() -> Iterator[dict]:
+        for path, item in source.object(("paths",)):
+            if not isinstance(item, dict):
+                continue
+            shared = item.get("parameters") or []
+            for method in HTTP_METHODS:
+                if isinstance(item.get(method), dict):
+                    yield _openapi_operation(base, path, method, shared, item[method])
+
+    return title, _rows()
+
+
+def _har_entry(entry: dict) -> dict:
+    request = entry.get("request") or {}
+    method = request.get("method") or "GET"
+    url, params = _split_query(request.get("url") or "")
+    if request.get("queryString"):
+        params = _pairs(request["queryString"], key="name")
+    headers = {
+        item["name"]: str(item.get("value") or "")
+        for item in request.get("headers") or []
+        if item.get("name")
+        and not item["name"].startswith(":")
+        and item["name"].lower() not in SKIPPED_HAR_HEADERS
+    }
+    body_type, body = "none", None
+    post_data = request.get("postData") or {}
+    mime_type = post_data.get("mimeType") or ""
+    if post_data.get("params") and "form" in mime_type:
+        body_type, body = "form", _pairs(post_data["params"], key="name")
+    elif post_data.get("text") is not None:
+        body_type, body = _json_or_raw(post_data["text"], "json" in mime_type)
+    name = f"{method.upper()} {urlsplit(url).path or '/'}"
+    return _row(name, method, url, headers, params, body_type, body)
+
+
+def har_rows(source: JsonSource) -> tuple[str, Iterator[dict]]:
+    title = source.value(("log", "pages"), None)
+    title = title[0].get("title") if title and isinstance(title[0], dict) else None
+    return title or "HAR import", (_har_entry(entry) for entry in source.array(("log", "entries")))
+
+
+IMPORTERS: dict[str, Callable[[JsonSource], tuple[str, Iterator[dict]]]] = {
+    "postman": postman_rows,
+    "openapi": openapi_rows,
+    "har": har_rows,
+}
+
+
+def _next_batch(rows: Iterator[dict], size: int) -> list[dict]:
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                break
+    except ImportFormatError:
+        raise
+    except Exception as exc:
+        raise ImportFormatError(f"invalid import file: {exc}") from exc
+    return batch
+
+
+def _open_source(fileobj: IO[bytes], fmt: str) -> JsonSource:
+    fileobj.seek(0)
+    head = fileobj.read(SNIFF_BYTES).lstrip()
+    if fmt == "openapi" and head and not head.startswith((b"{", b"[")):
+        return JsonSource.from_yaml(fileobj)
+    return JsonSource(fileobj)
+
+
+def _open_import(fileobj: IO[bytes], fmt: str) -> tuple[str, str, Iterator[dict]]:
+    if fmt == "auto":
+        fmt = detect_format(fileobj)
+    try:
+        title, rows = IMPORTERS[fmt](_open_source(fileobj, fmt))
+    except ImportFormatError:
+        raise
+    except Exception as exc:
+        raise ImportFormatError(f"invalid {fmt} file: {exc}") from exc
+    return fmt, str(title), rows
+
+
+async def import_collection(
+    db: AsyncSession, fileobj: IO[bytes], fmt: str, name: str | None
+) -> tuple[Collection, str, int]:
+    fmt, title, rows = await asyncio.to_thread(_open_import, fileobj, fmt)
+    collection = Collection(name=(name or title)[:150], description=f"Imported from {fmt}")
+    db.add(collection)
+    await db.flush()
+    imported = 0
+    while batch := await asyncio.to_thread(_next_batch, rows, settings.transfer_batch_size):
+        for row in batch:
+            row["collection_id"] = collection.id
+        await db.execute(insert(Request), batch)
+        imported += len(batch)
+    await db.commit()
+    return collection, fmt, imported
+
+
+def _postman_export_auth(auth: dict) -> dict | None:
+    auth_type = auth.get("type")
+    if auth_type == "bearer":
+        token = {"key": "token", "value": auth.get("token") or "", "type": "string"}
+        return {"type": "bearer", "bearer": [token]}
+    if auth_type == "basic":
+        return {
+            "type": "basic",
+            "basic": [
+                {"key": "username", "value": auth.get("username") or "", "type": "string"},
+                {"key": "password", "value": auth.get("password") or "", "type": "string"},
+            ],
+        }
+    if auth_type == "api_key":
+        return {
+            "type": "apikey",
+            "apikey": [
+                {"key": "key", "value": auth.get("key") or "", "type": "string"},
+                {"key": "value", "value": auth.get("value") or "", "type": "string"},
+                {"key": "in", "value": auth.get("in") or "header", "type": "string"},
+            ],
+        }
+    return None
+
+
+def _postman_export_body(body_type: str, body: Any) -> dict | None:
+    if body_type == "json":
+        raw = json.dumps(body, indent=2, ensure_ascii=False)
+        return {"mode": "raw", "raw": raw, "options": {"raw": {"language": "json"}}}
+    if body_type == "form":
+        pairs = [{"key": key, "value": str(value)} for key, value in (body or {}).items()]
+        return {"mode": "urlencoded", "urlencoded": pairs}
+    if body_type == "raw":
+        return {"mode": "raw", "raw": body if isinstance(body, str) else json.dumps(body)}
+    return None
+
+
+def postman_item(request: Request) -> dict:
+    params = request.params or {}
+    postman_request: dict[str, Any] = {
+        "method": request.method,
+        "header": [{"key": k, "value": v} for k, v in (request.headers or {}).items()],
+        "url": {
+            "raw": request.url + ("?" + urlencode(params) if params else ""),
+            "query": [{"key": k, "value": v} for k, v in params.items()],
+        },
+    }
+    body = _postman_export_body(request.body_type, request.body)
+    if body is not None:
+        postman_request["body"] = body
+    auth = _postman_export_auth(request.auth or {})
+    if auth is not None:
+        postman_request["auth"] = auth
+    return {"name": request.name, "request": postman_request}
+
+
+async def export_postman(collection: Collection) -> AsyncIterator[str]:
+    info = {
+        "name": collection.name,
+        "description": collection.description,
+        "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+    }
+    yield '{"info": ' + json.dumps(info, ensure_ascii=False) + ', "item": ['
+    cursor = 0
+    first = True
+    async with SessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(Request)
+                .where(Request.collection_id == collection.id, Request.id > cursor)
+                .order_by(Request.id)
+                .limit(settings.transfer_batch_size)
+            )
+            requests = result.scalars().all()
+            if not requests:
+                break
+            items = ",".join(
+                json.dumps(postman_item(request), ensure_ascii=False, default=str) for request in requests
+            )
+            yield items if first else "," + items
+            first = False
+            cursor = requests[-1].id
+            db.expunge_all()
+    yield "]}"
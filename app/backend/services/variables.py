@@ -1,17 +1,134 @@
 from __future__ import annotations
 
+import random
 import re
-from typing import Any
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable
 
 
-VAR_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+VAR_PATTERN = re.compile(r"\{\{\s*(\$?[\w.-]+)\s*(?:\|([^}]*))?\}\}")
+MAX_NESTING = 10
 
+DYNAMIC_VARIABLES: dict[str, Callable[[], str]] = {
+    "$uuid": lambda: str(uuid.uuid4()),
+    "$guid": lambda: str(uuid.uuid4()),
+    "$timestamp": lambda: str(int(time.time())),
+    "$isoTimestamp": lambda: datetime.now(timezone.utc).isoformat(),
+    "$randomInt": lambda: str(random.randint(0, 1000)),
+}
 
-def substitute_variables(value: Any, variables: dict[str, str]) -> Any:
+
+def _lookup(name: str, default: str | None, raw: str, variables: dict[str, str], depth: int) -> str:
+    generator = DYNAMIC_VARIABLES.get(name)
+    if generator is not None:
+        return generator()
+    value = variables.get(name)
+    if value is None:
+        return raw if default is None else default
+    value = str(value)
+    if depth < MAX_NESTING and "{{" in value:
+        return _compile_text(value).render(variables, depth + 1)
+    return value
+
+
+class Template:
+    is_static = True
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def render(self, variables: dict[str, str], depth: int = 0) -> Any:
+        return self.value
+
+
+class TextTemplate(Template):
+    is_static = False
+
+    def __init__(self, parts: list[str | tuple[str, str | None, str]]):
+        self.parts = parts
+
+    def render(self, variables: dict[str, str], depth: int = 0) -> str:
+        return "".join(
+            part if isinstance(part, str) else _lookup(part[0], part[1], part[2], variables, depth)
+            for part in self.parts
+        )
+
+
+class DictTemplate(Template):
+    is_static = False
+
+    def __init__(self, value: dict, dynamic: dict[Any, Template]):
+        self.value = value
+        self.dynamic = dynamic
+
+    def render(self, variables: dict[str, str], depth: int = 0) -> dict:
+        rendered = dict(self.value)
+        for key, template in self.dynamic.items():
+            rendered[key] = template.render(variables, depth)
+        return rendered
+
+
+class ListTemplate(Template):
+    is_static = False
+
+    def __init__(self, value: list, dynamic: dict[int, Template]):
+        self.value = value
+        self.dynamic = dynamic
+
+    def render(self, variables: dict[str, str], depth: int = 0) -> list:
+        rendered = list(self.value)
+        for index, template in self.dynamic.items():
+            rendered[index] = template.render(variables, depth)
+        return rendered
+
+
+@lru_cache(maxsize=4096)
+def _compile_text(text: str) -> Template:
+    parts: list[str | tuple[str, str | None, str]] = []
+    position = 0
+    for match in VAR_PATTERN.finditer(text):
+        if match.start() > position:
+            parts.append(text[position : match.start()])
+        default = match.group(2)
+        parts.append((match.group(1), default.strip() if default is not None else None, match.group(0)))
+        position = match.end()
+    if not parts:
+        return Template(text)
+    if position < len(text):
+        parts.append(text[position:])
+    return TextTemplate(parts)
+
+
+def compile_template(value: Any) -> Template:
     if isinstance(value, str):
-        return VAR_PATTERN.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+        return _compile_text(value) if "{{" in value else Template(value)
     if isinstance(value, dict):
-        return {k: substitute_variables(v, variables) for k, v in value.items()}
+        dynamic = {}
+        for key, item in value.items():
+            template = compile_template(item)
+            if not template.is_static:
+                dynamic[key] = template
+        return DictTemplate(value, dynamic) if dynamic else Template(value)
     if isinstance(value, list):
-        return [substitute_variables(v, variables) for v in value]
-    return value
+        dynamic = {}
+        for index, item in enumerate(value):
+            template = compile_template(item)
+            if not template.is_static:
+                dynamic[index] = template
+        return ListTemplate(value, dynamic) if dynamic else Template(value)
+    return Template(value)
+
+
+def template_variables(template: Template) -> set[str]:
+    if isinstance(template, TextTemplate):
+        return {part[0] for part in template.parts if not isinstance(part, str) and part[0] not in DYNAMIC_VARIABLES}
+    if isinstance(template, (DictTemplate, ListTemplate)):
+        return set().union(*(template_variables(child) for child in template.dynamic.values()))
+    return set()
+
+
+def substitute_variables(value: Any, variables: dict[str, str]) -> Any:
+    return compile_template(value).render(variables)
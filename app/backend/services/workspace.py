@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.models.collection import Collection
+from app.backend.models.request import Request
+
+SUMMARY_COLUMNS = (Request.id, Request.name, Request.method, Request.url, Request.collection_id)
+
+
+async def page_requests(
+    db: AsyncSession, collection_id: int | None, cursor: int | None, limit: int
+) -> tuple[list[Request], int | None]:
+    statement = select(Request)
+    if collection_id is not None:
+        statement = statement.where(Request.collection_id == collection_id)
+    if cursor is not None:
+        statement = statement.where(Request.id > cursor)
+    result = await db.execute(statement.order_by(Request.id).limit(limit))
+    items = list(result.scalars())
+    return items, items[-1].id if len(items) == limit else None
+
+
+async def workspace_tree(db: AsyncSession) -> dict[str, Any]:
+    collections = (await db.execute(select(Collection).order_by(Collection.id))).scalars().all()
+    rows = await db.execute(select(*SUMMARY_COLUMNS).order_by(Request.collection_id, Request.id))
+    grouped: dict[int | None, list[dict[str, Any]]] = {}
+    for row in rows.mappings():
+        grouped.setdefault(row["collection_id"], []).append(dict(row))
+    return {
+        "collections": [
+            {
+                "id": collection.id,
+                "name": collection.name,
+                "description": collection.description,
+                "requests": grouped.get(collection.id, []),
+            }
+            for collection in collections
+        ],
+        "unassigned": grouped.get(None, []),
+    }
+
+
+async def delete_collections(db: AsyncSession, ids: list[int]) -> int:
+    await db.execute(delete(Request).where(Request.collection_id.in_(ids)))
+    result = await db.execute(delete(Collection).where(Collection.id.in_(ids)))
+    await db.commit()
+    return result.rowcount or 0
@@ -6,15 +6,97 @@ import httpx
 
 
 class ApiClient:
-    def __init__(self, base_url: str = "http://127.0.0.1:8001"):
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8001",
+        timeout: float = 10.0,
+        execute_timeout: float = 60.0,
+        max_connections: int = 20,
+    ):
         self.base_url = base_url.rstrip("/")
+        self.execute_timeout = execute_timeout
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
 
-    def list_envs(self) -> list[dict[str, Any]]:
-        response = httpx.get(f"{self.base_url}/envs")
+    def close(self) -> None:
+        self._client.close()
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = self._client.request(method, path, **kwargs)
         response.raise_for_status()
         return response.json()
 
+    def list_envs(self) -> list[dict[str, Any]]:
+        return self._request("GET", "/envs")
+
     def execute(self, payload: dict[str, Any]) -> dict[str, Any]:
-        response = httpx.post(f"{self.base_url}/execute", json=payload, timeout=30.0)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", "/execute", json=payload, timeout=self.execute_timeout)
+
+    def cancel(self, execution_id: str) -> bool:
+        response = self._client.delete(f"/execute/{execution_id}")
+        return response.status_code == 200
+
+    def list_collections(self) -> list[dict[str, Any]]:
+        return self._request("GET", "/collections")
+
+    def workspace_tree(self) -> dict[str, Any]:
+        return self._request("GET", "/collections/tree")
+
+    def list_collection_requests(
+        self, collection_id: int, cursor: int | None = None, limit: int = 100
+    ) -> dict[str, Any]:
+        params = {"cursor": cursor, "limit": limit}
+        return self._request(
+            "GET", f"/collections/{collection_id}/requests", params={k: v for k, v in params.items() if v is not None}
+        )
+
+    def create_collection(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._request("POST", "/collections", json=payload)
+
+    def update_collection(self, collection_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._request("PUT", f"/collections/{collection_id}", json=payload)
+
+    def delete_collection(self, collection_id: int) -> dict[str, Any]:
+        return self._request("DELETE", f"/collections/{collection_id}")
+
+    def run_collection(self, collection_id: int, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+        return self._request(
+            "POST", f"/collections/{collection_id}/run", json=payload or {}, timeout=self.execute_timeout
+        )
+
+    def get_request(self, request_id: int) -> dict[str, Any]:
+        return self._request("GET", f"/requests/{request_id}")
+
+    def create_request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._request("POST", "/requests", json=payload)
+
+    def update_request(self, request_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+        return self._request("PUT", f"/requests/{request_id}", json=payload)
+
+    def delete_request(self, request_id: int) -> dict[str, Any]:
+        return self._request("DELETE", f"/requests/{request_id}")
+
+    def create_requests(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return self._request("POST", "/requests/batch", json={"items": items})
+
+    def update_requests(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return self._request("PUT", "/requests/batch", json={"items": items})
+
+    def delete_requests(self, ids: list[int]) -> dict[str, Any]:
+        return self._request("POST", "/requests/batch/delete", json={"ids": ids})
+
+    def list_history(self, cursor: int | None = None, limit: int = 50, **filters: Any) -> dict[str, Any]:
+        params = {"cursor": cursor, "limit": limit, **filters}
+        return self._request("GET", "/history", params={k: v for k, v in params.items() if v is not None})
+
+    def get_history(self, history_id: int, include_body: bool = False) -> dict[str, Any]:
+        return self._request("GET", f"/history/{history_id}", params={"include_body": include_body})
+
+    def delete_history(self, history_id: int) -> dict[str, Any]:
+        return self._request("DELETE", f"/history/{history_id}")
+
+    def clear_history(self, **filters: Any) -> dict[str, Any]:
+        return self._request("DELETE", "/history", params={k: v for k, v in filters.items() if v is not None})
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from PySide6 import QtCore
+
+
+class WorkerSignals(QtCore.QObject):
+    finished = QtCore.Signal(str, object)
+    failed = QtCore.Signal(str, str)
+
+
+class Worker(QtCore.QRunnable):
+    def __init__(self, fn: Callable[..., Any], *args: Any, tag: str = "", **kwargs: Any):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.tag = tag
+        self.signals = WorkerSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as exc:
+            self.signals.failed.emit(self.tag, str(exc))
+            return
+        self.signals.finished.emit(self.tag, result)
@@ -1,43 +1,148 @@
 from __future__ import annotations
 
 import json
+import uuid
+from functools import lru_cache
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from app.frontend.services.api_client import ApiClient
+from app.frontend.services.worker import Worker
 from app.frontend.viewmodels.request_vm import RequestViewModel
+from app.frontend.widgets.response_viewer import ResponseViewer
+
+
+FORMAT_SYNC_MAX_CHARS = 64 * 1024
+FORMAT_MAX_CHARS = 2 * 1024 * 1024
+CANCEL_THREADS = 2
+
+
+@lru_cache(maxsize=1)
+def _cancel_pool() -> QtCore.QThreadPool:
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(CANCEL_THREADS)
+    return pool
+
+
+def _common_prefix(a: str, b: str) -> int:
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def format_json_edit(text: str) -> tuple[int, int, str] | None:
+    stripped = text.strip()
+    if not stripped:
+        return None
+    try:
+        parsed = json.loads(stripped)
+    except json.JSONDecodeError:
+        return None
+    formatted = json.dumps(parsed, indent=2, ensure_ascii=False, sort_keys=True)
+    if formatted == text:
+        return None
+    start = _common_prefix(text, formatted)
+    tail = _common_suffix(text, formatted, min(len(text), len(formatted)) - start)
+    return start, len(text) - tail, formatted[start : len(formatted) - tail]
+
+
+def _map_position(text: str, pos: int, start: int, end: int, replacement: str) -> int:
+    if pos <= start:
+        return pos
+    if pos >= end:
+        return pos + len(replacement) - (end - start)
+    significant = sum(1 for ch in text[start:pos] if not ch.isspace())
+    for offset, ch in enumerate(replacement):
+        if significant == 0:
+            return start + offset
+        if not ch.isspace():
+            significant -= 1
+    return start + len(replacement)
+
+
+def _utf16_offset(text: str, index: int) -> int:
+    if text.isascii():
+        return index
+    return len(text[:index].encode("utf-16-le")) // 2
+
+
+def _code_point_offset(text: str, position: int) -> int:
+    if text.isascii():
+        return position
+    return len(text.encode("utf-16-le")[: position * 2].decode("utf-16-le", "ignore"))
 
 
 class JsonEditor(QtWidgets.QPlainTextEdit):
     def __init__(self):
         super().__init__()
         self.setTabStopDistance(4 * self.fontMetrics().horizontalAdvance(" "))
+        self._revision = 0
+        self._applying = False
+        self._pending_text = ""
         self._format_timer = QtCore.QTimer(self)
         self._format_timer.setSingleShot(True)
         self._format_timer.timeout.connect(self._format_if_valid)
         self.textChanged.connect(self._schedule_format)
 
     def _schedule_format(self) -> None:
+        self._revision += 1
+        if self._applying:
+            return
         self._format_timer.start(600)
 
+    def format_now(self) -> None:
+        self._format_timer.stop()
+        self._format_if_valid()
+
     def _format_if_valid(self) -> None:
-        text = self.toPlainText().strip()
-        if not text:
+        text = self.toPlainText()
+        if len(text) > FORMAT_MAX_CHARS:
             return
-        try:
-            parsed = json.loads(text)
-        except json.JSONDecodeError:
+        if len(text) <= FORMAT_SYNC_MAX_CHARS:
+            self._apply_edit(text, self._revision, format_json_edit(text))
             return
+        self._pending_text = text
+        worker = Worker(format_json_edit, text, tag=str(self._revision))
+        worker.signals.finished.connect(self._on_formatted)
+        QtCore.QThreadPool.globalInstance().start(worker)
 
-        formatted = json.dumps(parsed, indent=2, ensure_ascii=False, sort_keys=True)
-        if formatted == text:
-            return
+    def _on_formatted(self, tag: str, edit: tuple[int, int, str] | None) -> None:
+        self._apply_edit(self._pending_text, int(tag), edit)
 
+    def _apply_edit(self, text: str, revision: int, edit: tuple[int, int, str] | None) -> None:
+        if edit is None or revision != self._revision:
+            return
+        start, end, replacement = edit
         cursor = self.textCursor()
-        old_pos = cursor.position()
-        self.setPlainText(formatted)
-        new_pos = min(old_pos, len(formatted))
-        cursor.setPosition(new_pos)
+        new_pos = _map_position(text, _code_point_offset(text, cursor.position()), start, end, replacement)
+        new_text = text[:start] + replacement + text[end:]
+        self._applying = True
+        try:
+            edit_cursor = QtGui.QTextCursor(self.document())
+            edit_cursor.beginEditBlock()
+            edit_cursor.setPosition(_utf16_offset(text, start))
+            edit_cursor.setPosition(_utf16_offset(text, end), QtGui.QTextCursor.KeepAnchor)
+            edit_cursor.insertText(replacement)
+            edit_cursor.endEditBlock()
+        finally:
+            self._applying = False
+        cursor.setPosition(_utf16_offset(new_text, new_pos))
         self.setTextCursor(cursor)
 
     def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
@@ -93,6 +198,7 @@ class RequestTab(QtWidgets.QWidget):
     def __init__(self, vm: RequestViewModel):
         super().__init__()
         self.vm = vm
+        self._execution_id: str | None = None
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -108,12 +214,21 @@ class RequestTab(QtWidgets.QWidget):
         self.env_combo.setMinimumWidth(180)
         self.format_btn = QtWidgets.QPushButton("Format JSON")
         self.send_btn = QtWidgets.QPushButton("Send")
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setVisible(False)
+        self.busy_bar = QtWidgets.QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(80)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setVisible(False)
 
         top_bar.addWidget(self.method_combo)
         top_bar.addWidget(self.url_input, 1)
         top_bar.addWidget(self.env_combo)
         top_bar.addWidget(self.format_btn)
+        top_bar.addWidget(self.busy_bar)
         top_bar.addWidget(self.send_btn)
+        top_bar.addWidget(self.cancel_btn)
 
         layout.addLayout(top_bar)
 
@@ -141,14 +256,14 @@ class RequestTab(QtWidgets.QWidget):
         response_box = QtWidgets.QGroupBox("Response")
         response_layout = QtWidgets.QVBoxLayout(response_box)
         self.response_meta = QtWidgets.QLabel("Status: - | Time: -ms | Size: -")
-        self.response_view = QtWidgets.QPlainTextEdit()
-        self.response_view.setReadOnly(True)
+        self.response_view = ResponseViewer()
         response_layout.addWidget(self.response_meta)
         response_layout.addWidget(self.response_view, 1)
 
         splitter.addWidget(response_box)
 
         self.send_btn.clicked.connect(self._on_send)
+        self.cancel_btn.clicked.connect(self._on_cancel)
         self.format_btn.clicked.connect(self._format_all)
 
     def set_envs(self, envs: list[dict]) -> None:
@@ -159,60 +274,88 @@ class RequestTab(QtWidgets.QWidget):
 
     def _format_all(self) -> None:
         for editor in (self.headers_editor, self.params_editor, self.body_editor, self.auth_editor):
-            self._format_json_editor(editor)
-
-    def _format_json_editor(self, editor: QtWidgets.QPlainTextEdit) -> None:
-        text = editor.toPlainText().strip()
-        if not text:
-            return
-        parsed = json.loads(text)
-        editor.setPlainText(json.dumps(parsed, indent=2, ensure_ascii=False, sort_keys=True))
+            editor.format_now()
 
     def _on_send(self) -> None:
-        try:
-            self._format_all()
-            headers = self._parse_json(self.headers_editor.toPlainText())
-            params = self._parse_json(self.params_editor.toPlainText())
-            body = self._parse_json(self.body_editor.toPlainText(), allow_any=True)
-            auth = self._parse_json(self.auth_editor.toPlainText())
-        except json.JSONDecodeError as exc:
-            self.response_view.setPlainText(f"Invalid JSON: {exc}")
-            return
-
-        if headers is None or params is None or auth is None:
-            self.response_view.setPlainText("Headers, Params, and Auth must be JSON objects")
-            return
-
         payload = {
             "method": self.method_combo.currentText(),
             "url": self.url_input.text().strip(),
-            "headers": headers,
-            "params": params,
-            "body_type": "json" if body else "none",
-            "body": body,
-            "auth": auth or {"type": "none"},
             "env_id": self.env_combo.currentData(),
         }
-
         if not payload["url"]:
-            self.response_view.setPlainText("URL is required")
+            self.response_view.show_message("URL is required")
             return
 
-        try:
-            response = self.vm.execute(payload)
-        except Exception as exc:
-            self.response_view.setPlainText(f"Request failed: {exc}")
+        texts = {
+            "headers": self.headers_editor.toPlainText(),
+            "params": self.params_editor.toPlainText(),
+            "body": self.body_editor.toPlainText(),
+            "auth": self.auth_editor.toPlainText(),
+        }
+        self._format_all()
+        self._execution_id = uuid.uuid4().hex
+        payload["execution_id"] = self._execution_id
+        worker = Worker(self._execute_texts, payload, texts, tag=self._execution_id)
+        worker.signals.finished.connect(self._on_response)
+        worker.signals.failed.connect(self._on_failure)
+        self._set_busy(True)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_cancel(self) -> None:
+        if self._execution_id is None:
+            return
+        _cancel_pool().start(Worker(self.vm.cancel, self._execution_id))
+        self._execution_id = None
+        self._set_busy(False)
+        self.response_view.show_message("Request cancelled")
+
+    def cancel_pending(self) -> None:
+        self._on_cancel()
+
+    def _set_busy(self, busy: bool) -> None:
+        self.busy_bar.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+        self.send_btn.setEnabled(not busy)
+        if busy:
+            self.response_meta.setText("Sending...")
+
+    def _on_failure(self, execution_id: str, message: str) -> None:
+        if execution_id != self._execution_id:
+            return
+        self._execution_id = None
+        self._set_busy(False)
+        self.response_view.show_message(f"Request failed: {message}")
+
+    def _on_response(self, execution_id: str, response: dict) -> None:
+        if execution_id != self._execution_id:
             return
+        self._execution_id = None
+        self._set_busy(False)
 
         self.response_meta.setText(
             f"Status: {response.get('status_code')} | Time: {response.get('duration_ms')}ms | Size: {response.get('size_bytes')}"
         )
 
-        body_out = response.get("body")
-        if isinstance(body_out, (dict, list)):
-            self.response_view.setPlainText(json.dumps(body_out, indent=2, ensure_ascii=False))
-        else:
-            self.response_view.setPlainText(str(body_out))
+        self.response_view.set_body(response.get("body"))
+
+    def _execute_texts(self, payload: dict, texts: dict[str, str]) -> dict:
+        try:
+            headers = self._parse_json(texts["headers"])
+            params = self._parse_json(texts["params"])
+            body = self._parse_json(texts["body"], allow_any=True)
+            auth = self._parse_json(texts["auth"])
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        if headers is None or params is None or auth is None:
+            raise ValueError("Headers, Params, and Auth must be JSON objects")
+        payload.update(
+            headers=headers,
+            params=params,
+            body_type="json" if body else "none",
+            body=body,
+            auth=auth or {"type": "none"},
+        )
+        return self.vm.execute(payload)
 
     @staticmethod
     def _parse_json(text: str, allow_any: bool = False):
@@ -230,6 +373,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle("Kanjakitude - MyPostman")
         self.resize(1200, 800)
 
+        QtCore.QThreadPool.globalInstance().setMaxThreadCount(max(QtCore.QThread.idealThreadCount(), 16))
         self.client = ApiClient()
         self.vm = RequestViewModel(self.client)
         self.envs_cache: list[dict] = []
@@ -272,6 +416,8 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         widget = self.request_tabs.widget(index)
         self.request_tabs.removeTab(index)
+        if isinstance(widget, RequestTab):
+            widget.cancel_pending()
         if widget is not None:
             widget.deleteLater()
 
@@ -289,6 +435,16 @@ class MainWindow(QtWidgets.QMainWindow):
         if ok and new_name.strip():
             self.request_tabs.setTabText(index, new_name.strip())
 
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        for i in range(self.request_tabs.count()):
+            widget = self.request_tabs.widget(i)
+            if isinstance(widget, RequestTab):
+                widget.cancel_pending()
+        _cancel_pool().waitForDone(2000)
+        QtCore.QThreadPool.globalInstance().waitForDone(2000)
+        self.client.close()
+        super().closeEvent(event)
+
     def _load_envs(self) -> None:
         try:
             self.envs_cache = self.vm.list_envs()
@@ -16,6 +16,9 @@ class RequestViewModel:
     def execute(self, payload: dict[str, Any]) -> dict[str, Any]:
         return self.client.execute(payload)
 
+    def cancel(self, execution_id: str) -> bool:
+        return self.client.cancel(execution_id)
+
     @staticmethod
     def parse_json(text: str) -> dict:
         if not text.strip():
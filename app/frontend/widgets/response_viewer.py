@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+from PySide6 import QtCore, QtWidgets
+
+from app.frontend.services.worker import Worker
+
+PAGE_CHARS = 256 * 1024
+CHILDREN_PER_PAGE = 200
+MAX_SEARCH_RESULTS = 200
+PATH_ROLE = QtCore.Qt.ItemDataRole.UserRole
+MORE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+
+
+def _iter_text(body: Any) -> Iterator[str]:
+    if isinstance(body, (dict, list)):
+        return json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(body)
+    text = "" if body is None else str(body)
+    return (text[i : i + PAGE_CHARS] for i in range(0, len(text), PAGE_CHARS))
+
+
+def _take_page(chunks: Iterator[str], limit: int) -> tuple[str, bool]:
+    parts: list[str] = []
+    size = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            return "".join(parts), False
+    return "".join(parts), True
+
+
+def _preview(value: Any) -> str:
+    if isinstance(value, dict):
+        return f"{{{len(value)} keys}}"
+    if isinstance(value, list):
+        return f"[{len(value)} items]"
+    return json.dumps(value, ensure_ascii=False)[:200]
+
+
+def _children(value: Any) -> list[tuple[Any, Any]] | None:
+    if isinstance(value, dict):
+        return list(value.items())
+    if isinstance(value, list):
+        return list(enumerate(value))
+    return None
+
+
+def search_body(body: Any, query: str, limit: int = MAX_SEARCH_RESULTS) -> list[tuple[tuple, str]]:
+    needle = query.lower()
+    matches: list[tuple[tuple, str]] = []
+    stack: list[tuple[tuple, Any]] = [((), body)]
+    while stack and len(matches) < limit:
+        path, value = stack.pop()
+        children = _children(value)
+        if children is None:
+            if needle in str(value).lower():
+                matches.append((path, _preview(value)))
+            continue
+        for key, child in reversed(children):
+            if isinstance(key, str) and needle in key.lower() and len(matches) < limit:
+                matches.append(((*path, key), _preview(child)))
+            stack.append(((*path, key), child))
+    return matches
+
+
+class ResponseViewer(QtWidgets.QWidget):
+    def __init__(self):
+        super().__init__()
+        self._body: Any = None
+        self._chunks: Iterator[str] | None = None
+        self._generation = 0
+        self._build_ui()
+
+    def _build_ui(self) -> None:
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        search_bar = QtWidgets.QHBoxLayout()
+        self.search_input = QtWidgets.QLineEdit()
+        self.search_input.setPlaceholderText("Search keys and values")
+        self.search_btn = QtWidgets.QPushButton("Find")
+        self.load_more_btn = QtWidgets.QPushButton("Load more")
+        self.load_more_btn.setEnabled(False)
+        search_bar.addWidget(self.search_input, 1)
+        search_bar.addWidget(self.search_btn)
+        search_bar.addWidget(self.load_more_btn)
+        layout.addLayout(search_bar)
+
+        self.tabs = QtWidgets.QTabWidget()
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setHeaderLabels(["Key", "Value"])
+        self.tree.setUniformRowHeights(True)
+        self.raw_view = QtWidgets.QPlainTextEdit()
+        self.raw_view.setReadOnly(True)
+        self.tabs.addTab(self.raw_view, "Raw")
+        self.tabs.addTab(self.tree, "Tree")
+
+        self.search_results = QtWidgets.QListWidget()
+        self.search_results.setVisible(False)
+        self.search_results.setMaximumHeight(120)
+
+        layout.addWidget(self.tabs, 1)
+        layout.addWidget(self.search_results)
+
+        self.tree.itemExpanded.connect(self._on_item_expanded)
+        self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.load_more_btn.clicked.connect(self._load_next_page)
+        self.search_btn.clicked.connect(self._on_search)
+        self.search_input.returnPressed.connect(self._on_search)
+        self.search_results.itemActivated.connect(self._on_search_result)
+
+    def show_message(self, text: str) -> None:
+        self._reset()
+        self.raw_view.setPlainText(text)
+        self.tabs.setCurrentWidget(self.raw_view)
+
+    def set_body(self, body: Any) -> None:
+        self._reset()
+        self._body = body
+        self._chunks = _iter_text(body)
+        is_tree = isinstance(body, (dict, list))
+        self.tabs.setTabEnabled(self.tabs.indexOf(self.tree), is_tree)
+        if is_tree:
+            self._populate(self.tree.invisibleRootItem(), body, [], 0)
+        self._load_next_page()
+
+    def _reset(self) -> None:
+        self._generation += 1
+        self._body = None
+        self._chunks = None
+        self.tree.clear()
+        self.raw_view.clear()
+        self.search_results.clear()
+        self.search_results.setVisible(False)
+        self.load_more_btn.setEnabled(False)
+
+    def _load_next_page(self) -> None:
+        if self._chunks is None:
+            return
+        self.load_more_btn.setEnabled(False)
+        worker = Worker(_take_page, self._chunks, PAGE_CHARS, tag=str(self._generation))
+        worker.signals.finished.connect(self._on_page)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_page(self, generation: str, result: tuple[str, bool]) -> None:
+        if generation != str(self._generation):
+            return
+        text, exhausted = result
+        cursor = self.raw_view.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(text)
+        self.load_more_btn.setEnabled(not exhausted)
+        if exhausted:
+            self._chunks = None
+
+    def _populate(self, parent: QtWidgets.QTreeWidgetItem, value: Any, path: list, start: int) -> None:
+        children = _children(value) or []
+        end = min(start + CHILDREN_PER_PAGE, len(children))
+        for key, child in children[start:end]:
+            item = QtWidgets.QTreeWidgetItem([str(key), _preview(child)])
+            item.setData(0, PATH_ROLE, [*path, key])
+            if _children(child):
+                item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            parent.addChild(item)
+        if end < len(children):
+            more = QtWidgets.QTreeWidgetItem([f"... {len(children) - end} more (double-click)", ""])
+            more.setData(0, MORE_ROLE, end)
+            parent.addChild(more)
+
+    def _value_at(self, path: list) -> Any:
+        value = self._body
+        for key in path:
+            value = value[key]
+        return value
+
+    def _ensure_populated(self, item: QtWidgets.QTreeWidgetItem) -> None:
+        path = item.data(0, PATH_ROLE)
+        if item.childCount() == 0 and path is not None:
+            value = self._value_at(path)
+            if _children(value):
+                self._populate(item, value, path, 0)
+
+    def _on_item_expanded(self, item: QtWidgets.QTreeWidgetItem) -> None:
+        self._ensure_populated(item)
+
+    def _load_more_children(self, more: QtWidgets.QTreeWidgetItem) -> None:
+        parent = more.parent() or self.tree.invisibleRootItem()
+        start = more.data(0, MORE_ROLE)
+        parent.removeChild(more)
+        if parent is self.tree.invisibleRootItem():
+            self._populate(parent, self._body, [], start)
+        else:
+            path = parent.data(0, PATH_ROLE)
+            self._populate(parent, self._value_at(path), path, start)
+
+    def _on_item_double_clicked(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
+        if item.data(0, MORE_ROLE) is not None:
+            self._load_more_children(item)
+
+    def _on_search(self) -> None:
+        query = self.search_input.text().strip()
+        if not query or self._body is None:
+            return
+        worker = Worker(search_body, self._body, query, tag=str(self._generation))
+        worker.signals.finished.connect(self._on_search_done)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_search_done(self, generation: str, matches: list[tuple[tuple, str]]) -> None:
+        if generation != str(self._generation):
+            return
+        self.search_results.clear()
+        for path, preview in matches:
+            label = "$" + "".join(f"[{key}]" if isinstance(key, int) else f".{key}" for key in path)
+            entry = QtWidgets.QListWidgetItem(f"{label} = {preview}")
+            entry.setData(PATH_ROLE, list(path))
+            self.search_results.addItem(entry)
+        if not matches:
+            self.search_results.addItem("No matches")
+        self.search_results.setVisible(True)
+
+    def _on_search_result(self, entry: QtWidgets.QListWidgetItem) -> None:
+        path = entry.data(PATH_ROLE)
+        if path is None:
+            return
+        if not isinstance(self._body, (dict, list)):
+            self._find_in_raw(self.search_input.text().strip())
+            return
+        parent = self.tree.invisibleRootItem()
+        item = None
+        for key in path:
+            item = self._find_child(parent, key)
+            if item is None:
+                return
+            self._ensure_populated(item)
+            parent = item
+        if item is not None:
+            self.tabs.setCurrentWidget(self.tree)
+            self.tree.scrollToItem(item)
+            self.tree.setCurrentItem(item)
+
+    def _find_child(self, parent: QtWidgets.QTreeWidgetItem, key: Any) -> QtWidgets.QTreeWidgetItem | None:
+        while True:
+            for index in range(parent.childCount()):
+                child = parent.child(index)
+                child_path = child.data(0, PATH_ROLE)
+                if child_path is not None and child_path[-1] == key:
+                    parent.setExpanded(True)
+                    return child
+            last = parent.child(parent.childCount() - 1) if parent.childCount() else None
+            if last is None or last.data(0, MORE_ROLE) is None:
+                return None
+            self._load_more_children(last)
+
+    def _find_in_raw(self, query: str) -> None:
+        self.tabs.setCurrentWidget(self.raw_view)
+        if not self.raw_view.find(query):
+            self.raw_view.moveCursor(self.raw_view.textCursor().MoveOperation.Start)
+            self.raw_view.find(query)
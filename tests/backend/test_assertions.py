@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import pytest
+
+from app.backend.services.assertions import MISSING, compare, compile_jsonpath, compile_test, evaluate_jsonpath
+from app.backend.services.executor import compile_request
+from app.backend.services.tests import run_tests
+
+SNAPSHOT = {
+    "status_code": 200,
+    "headers": {"Content-Type": "application/json"},
+    "body": {"user": {"id": 7, "name": "ada"}, "items": [{"id": 1}, {"id": 2}]},
+    "duration_ms": 120,
+}
+
+
+def _passed(test: dict) -> bool:
+    [result] = run_tests([test], SNAPSHOT)
+    return result["passed"]
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("$.user.name", "ada"),
+        ("user.id", 7),
+        ("$.items[-1].id", 2),
+        ("$.items[*].id", [1, 2]),
+        ("$..id", [7, 1, 2]),
+        ("$['user']['name']", "ada"),
+        ("$.missing", MISSING),
+    ],
+)
+def test_evaluate_jsonpath(expression, expected):
+    assert evaluate_jsonpath(expression, SNAPSHOT["body"]) == expected
+
+
+def test_compile_jsonpath_rejects_garbage():
+    with pytest.raises(ValueError):
+        compile_jsonpath("$.user[")
+
+
+@pytest.mark.parametrize(
+    ("op", "actual", "expected", "result"),
+    [
+        ("equals", 1, 1, True),
+        ("contains", "hello", "ell", True),
+        ("in", "b", ["a", "b"], True),
+        ("gte", "5", 5, True),
+        ("lt", 2, 1, False),
+        ("matches", {"a": 1}, '"a"', True),
+        ("length", [1, 2], 2, True),
+        ("type", 1, "number", True),
+        ("type", True, "integer", False),
+        ("exists", MISSING, None, False),
+        ("not_exists", MISSING, None, True),
+        ("equals", MISSING, None, False),
+    ],
+)
+def test_compare(op, actual, expected, result):
+    assert compare(op, actual, expected) is result
+
+
+@pytest.mark.parametrize(
+    ("test", "passed"),
+    [
+        ({"type": "status_code", "expected": 200}, True),
+        ({"type": "json_key", "key": "user"}, True),
+        ({"type": "jsonpath", "path": "$.user.id", "expected": 7}, True),
+        ({"type": "jsonpath", "path": "$.user.id", "op": "gt", "expected": 10}, False),
+        ({"type": "header", "name": "content-type", "op": "contains", "expected": "json"}, True),
+        ({"type": "latency", "expected": 100}, False),
+        ({"type": "regex", "pattern": "ada"}, True),
+        ({"type": "body", "op": "contains", "expected": "items"}, True),
+        ({"type": "json_schema", "path": "$.user", "schema": {"type": "object", "required": ["id", "name"]}}, True),
+        ({"type": "json_schema", "schema": {"properties": {"items": {"type": "array", "maxItems": 1}}}}, False),
+    ],
+)
+def test_run_tests(test, passed):
+    assert _passed(test) is passed
+
+
+def test_run_tests_keeps_name():
+    [result] = run_tests([{"type": "status_code", "expected": 200, "name": "ok"}], SNAPSHOT)
+    assert result["name"] == "ok"
+
+
+@pytest.mark.parametrize(
+    "test",
+    [
+        {"type": "jsonpath", "path": "$.user.name", "op": "matches", "expected": "("},
+        {"type": "regex", "pattern": "("},
+        {"type": "json_schema", "schema": {"properties": {"user": {"properties": {"name": {"pattern": "("}}}}}},
+        {"type": "json_schema", "schema": {"patternProperties": {"[": {}}}},
+        {"type": "jmespath", "expression": "items[", "expected": 1},
+        {"type": "jsonpath", "path": "$.user[", "expected": 1},
+        {"type": "jsonpath", "path": "$.user.id", "op": "bogus", "expected": 1},
+        {"type": "nonsense"},
+    ],
+)
+def test_invalid_assertions_fail_instead_of_raising(test):
+    [result] = run_tests([test], SNAPSHOT)
+    assert result["passed"] is False
+    assert result["message"]
+
+
+def test_compare_errors_are_reported():
+    assert _passed({"type": "jsonpath", "path": "$.user.name", "op": "gt", "expected": 1}) is False
+
+
+def test_compile_test_is_cached():
+    test = {"type": "status_code", "expected": 200}
+    assert compile_test(test) is compile_test(dict(test))
+
+
+def test_compiled_request_reuses_its_test_suite():
+    spec = {"method": "GET", "url": "/items", "tests": [{"type": "status_code", "expected": 200, "name": "ok"}]}
+    compiled = compile_request(spec, "http://api.test")
+    assert compile_request(dict(spec), "http://api.test").tests is compiled.tests
+    assert compiled.tests.run(SNAPSHOT) == run_tests(spec["tests"], SNAPSHOT)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from app.backend.services.replay import request_fingerprint, snapshot_fingerprint
+
+
+def _fingerprint(**overrides):
+    spec = {
+        "method": "get",
+        "url": "https://api.test/items",
+        "headers": {"Accept": "application/json", "X-Trace": "1"},
+        "params": {"page": "1", "q": "x"},
+        "body_type": "none",
+        "body": None,
+    }
+    spec.update(overrides)
+    return request_fingerprint(**spec)
+
+
+def test_fingerprint_is_stable_across_orderings():
+    assert _fingerprint() == _fingerprint(
+        method="GET",
+        headers={"x-trace": "2", "accept": "application/json"},
+        params={"q": "x", "page": "1"},
+    )
+
+
+def test_fingerprint_ignores_unkeyed_headers_only():
+    assert _fingerprint(headers={"Accept": "application/json"}) == _fingerprint()
+    assert _fingerprint(headers={"Accept": "text/plain"}) != _fingerprint()
+    assert _fingerprint(headers={"Authorization": "Bearer a"}) != _fingerprint(headers={"Authorization": "Bearer b"})
+
+
+def test_fingerprint_distinguishes_request_parts():
+    base = _fingerprint()
+    assert _fingerprint(method="POST") != base
+    assert _fingerprint(url="https://api.test/other") != base
+    assert _fingerprint(params={"page": "2", "q": "x"}) != base
+    assert _fingerprint(body_type="json", body={"a": 1}) != _fingerprint(body_type="raw", body={"a": 1})
+
+
+def test_fingerprint_normalises_json_bodies():
+    assert _fingerprint(body={"a": 1, "b": [1, 2]}) == _fingerprint(body={"b": [1, 2], "a": 1})
+    assert _fingerprint(body=b"raw") == _fingerprint(body=b"raw")
+    assert _fingerprint(body=b"raw") != _fingerprint(body="raw")
+
+
+def test_snapshot_fingerprint_matches_request_fingerprint():
+    snapshot = {"method": "GET", "url": "https://api.test/items", "params": {"page": "1", "q": "x"}}
+    assert snapshot_fingerprint(snapshot) == request_fingerprint(
+        "GET", "https://api.test/items", {}, {"page": "1", "q": "x"}, "none", None
+    )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.backend.services.stats import LatencyHistogram, latency_summary, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 0) == 1
+    assert percentile([], 50) == 0
+
+
+def test_latency_summary_empty():
+    assert latency_summary([])["p99"] == 0
+
+
+def test_histogram_empty_summary():
+    summary = LatencyHistogram().summary_ms()
+    assert summary == {key: 0.0 for key in summary}
+
+
+def test_histogram_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(1, 201):
+        histogram.record(value)
+    assert histogram.value_at_percentile(50) == 100
+    assert histogram.value_at_percentile(100) == 200
+    assert histogram.min_us == 1
+
+
+def test_histogram_clamps_negative_values():
+    histogram = LatencyHistogram()
+    histogram.record(-5)
+    assert histogram.min_us == 0
+    assert histogram.value_at_percentile(50) == 0
+
+
+def test_histogram_never_exceeds_max():
+    histogram = LatencyHistogram()
+    histogram.record(1_000_001)
+    assert histogram.value_at_percentile(99.9) == 1_000_001
+    assert histogram.summary_ms()["max"] == 1000.001
+
+
+@pytest.mark.parametrize("pct", [50, 90, 99, 99.9])
+def test_histogram_tracks_exact_percentiles(pct):
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(10, 1.5)) for _ in range(20_000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    exact = percentile(sorted(values), pct)
+    approximate = histogram.value_at_percentile(pct)
+    assert exact <= approximate <= exact * (1 + 1 / 128) + 1
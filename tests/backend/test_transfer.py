@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from app.backend.services import transfer
+from app.backend.services.transfer import (
+    ImportFormatError,
+    JsonSource,
+    _open_source,
+    detect_format,
+    har_rows,
+    openapi_rows,
+    postman_rows,
+)
+
+POSTMAN = {
+    "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {
+            "name": "Users",
+            "item": [
+                {
+                    "name": "Create",
+                    "request": {
+                        "method": "POST",
+                        "url": {"raw": "{{base}}/users?x=1", "query": [{"key": "x", "value": "1"}]},
+                        "header": [{"key": "Content-Type", "value": "application/json"}],
+                        "body": {"mode": "raw", "raw": '{"name": "ada"}'},
+                        "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "t"}]},
+                    },
+                }
+            ],
+        },
+        {"name": "Ping", "request": "https://example.com/ping?a=b"},
+    ],
+}
+
+OPENAPI = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pets"},
+    "paths": {
+        "/pets/{id}": {
+            "parameters": [{"name": "id", "in": "path"}],
+            "get": {"operationId": "getPet", "parameters": [{"name": "full", "in": "query", "schema": {"default": True}}]},
+            "post": {"requestBody": {"content": {"application/json": {"example": {"name": "rex"}}}}},
+        }
+    },
+    "servers": [{"url": "https://api.example.com/v1/"}],
+}
+
+SWAGGER_YAML = b"""swagger: "2.0"
+info:
+  title: Legacy
+host: legacy.example.com
+basePath: /api/
+schemes: [http]
+paths:
+  /items:
+    get:
+      summary: List items
+      parameters:
+        - {name: X-Trace, in: header, default: abc}
+"""
+
+HAR = {
+    "log": {
+        "pages": [{"title": "Session"}],
+        "entries": [
+            {
+                "request": {
+                    "method": "POST",
+                    "url": "https://example.com/form?q=1",
+                    "headers": [{"name": ":authority", "value": "x"}, {"name": "Host", "value": "x"}, {"name": "A", "value": "b"}],
+                    "queryString": [{"name": "q", "value": "1"}],
+                    "postData": {"mimeType": "application/x-www-form-urlencoded", "params": [{"name": "k", "value": "v"}]},
+                }
+            }
+        ],
+    }
+}
+
+
+@pytest.fixture(params=["ijson", "json"])
+def parser(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(transfer, "ijson", None)
+    return request.param
+
+
+def _source(document) -> JsonSource:
+    return JsonSource(io.BytesIO(json.dumps(document).encode()))
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [(POSTMAN, "postman"), (OPENAPI, "openapi"), (HAR, "har")],
+)
+def test_detect_format_json(document, expected):
+    assert detect_format(io.BytesIO(json.dumps(document).encode())) == expected
+
+
+def test_detect_format_yaml_and_unknown():
+    assert detect_format(io.BytesIO(SWAGGER_YAML)) == "openapi"
+    with pytest.raises(ImportFormatError):
+        detect_format(io.BytesIO(b'{"hello": 1}'))
+
+
+def test_postman_rows(parser):
+    title, rows = postman_rows(_source(POSTMAN))
+    create, ping = list(rows)
+    assert title == "Shop"
+    assert create["name"] == "Users / Create"
+    assert (create["method"], create["url"], create["params"]) == ("POST", "{{base}}/users", {"x": "1"})
+    assert (create["body_type"], create["body"]) == ("json", {"name": "ada"})
+    assert create["auth"]["type"] == "bearer" and create["auth"]["token"] == "t"
+    assert (ping["url"], ping["params"], ping["auth"]["type"]) == ("https://example.com/ping", {"a": "b"}, "none")
+
+
+def test_openapi_rows(parser):
+    title, rows = openapi_rows(_source(OPENAPI))
+    get, post = list(rows)
+    assert title == "Pets"
+    assert get["url"] == "https://api.example.com/v1/pets/{{id}}"
+    assert (get["name"], get["params"]) == ("getPet", {"full": "true"})
+    assert (post["body_type"], post["body"], post["headers"]) == (
+        "json",
+        {"name": "rex"},
+        {"Content-Type": "application/json"},
+    )
+
+
+def test_openapi_yaml_rows():
+    pytest.importorskip("yaml")
+    title, rows = openapi_rows(_open_source(io.BytesIO(SWAGGER_YAML), "openapi"))
+    [row] = list(rows)
+    assert title == "Legacy"
+    assert row["url"] == "http://legacy.example.com/api/items"
+    assert (row["name"], row["headers"]) == ("List items", {"X-Trace": "abc"})
+
+
+def test_har_rows(parser):
+    title, rows = har_rows(_source(HAR))
+    [row] = list(rows)
+    assert title == "Session"
+    assert (row["name"], row["url"], row["params"]) == ("POST /form", "https://example.com/form", {"q": "1"})
+    assert row["headers"] == {"A": "b"}
+    assert (row["body_type"], row["body"]) == ("form", {"k": "v"})
+
+
+def test_values_reads_requested_paths_in_one_pass(parser):
+    source = _source(OPENAPI)
+    values = source.values([("info", "title"), ("servers",), ("host",), ("missing", "deep")])
+    assert values == {
+        ("info", "title"): "Pets",
+        ("servers",): [{"url": "https://api.example.com/v1/"}],
+        ("host",): None,
+        ("missing", "deep"): None,
+    }
+    assert source.value(("host",), "fallback") == "fallback"
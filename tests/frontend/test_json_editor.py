@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.frontend.ui.main_window import _code_point_offset, _map_position, _utf16_offset, format_json_edit
+
+
+def _apply(text: str, edit: tuple[int, int, str]) -> str:
+    start, end, replacement = edit
+    return text[:start] + replacement + text[end:]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"b":1,"a":[1,2]}',
+        '{\n  "a": 1, "b": {"c": null}}',
+        '{"a":"😀","b":1}',
+        '[{"z": "𝄞"}, "é"]',
+    ],
+)
+def test_format_json_edit_produces_formatted_text(text):
+    formatted = json.dumps(json.loads(text), indent=2, ensure_ascii=False, sort_keys=True)
+    assert _apply(text, format_json_edit(text)) == formatted
+
+
+def test_format_json_edit_touches_only_the_changed_span():
+    text = '{\n  "a": 1,\n  "b": [1,2],\n  "c": 3\n}'
+    start, end, replacement = format_json_edit(text)
+    assert start == text.index("[") + 1
+    assert text[end:].startswith("],")
+    assert replacement.split() == ["1,", "2"]
+
+
+@pytest.mark.parametrize("text", ["", "   ", "{bad", '{\n  "a": 1\n}'])
+def test_format_json_edit_skips_invalid_or_formatted_text(text):
+    assert format_json_edit(text) is None
+
+
+def _significant(text: str) -> str:
+    return "".join(text.split())
+
+
+def test_map_position_keeps_cursor_after_the_same_characters():
+    text = '{"a":1,"b":2}'
+    edit = format_json_edit(text)
+    formatted = _apply(text, edit)
+    for position in range(len(text) + 1):
+        mapped = _map_position(text, position, *edit)
+        assert _significant(formatted[:mapped]) == _significant(text[:position])
+
+
+def test_map_position_outside_the_edit():
+    assert _map_position("abcdef", 1, 2, 4, "XYZW") == 1
+    assert _map_position("abcdef", 5, 2, 4, "XYZW") == 7
+
+
+@pytest.mark.parametrize(
+    ("text", "index", "utf16"),
+    [("abc", 2, 2), ("😀x", 1, 2), ("a😀b😀", 4, 6), ("é𝄞", 2, 3)],
+)
+def test_utf16_offsets_round_trip(text, index, utf16):
+    assert _utf16_offset(text, index) == utf16
+    assert _code_point_offset(text, utf16) == index